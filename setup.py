@@ -0,0 +1,50 @@
+"""
+Optional build step that compiles the model and schema modules with Cython.
+
+Usage:
+    python setup.py build_ext --inplace
+
+The compiled extension modules are written next to their .py sources under
+src/ and take precedence on import. If the extensions have not been built
+(or Cython is not installed), the pure Python modules are used unchanged.
+"""
+import os
+import warnings
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
+SRC_DIR = 'src'
+
+COMPILED_MODULES = [
+    'schemas/auth_schemas.py',
+    'schemas/site_schemas.py',
+    'models/user.py',
+    'models/verification_result.py',
+    'models/verification_token_status.py',
+]
+
+
+def get_ext_modules() -> list:
+    """Get the Cython extension modules, or an empty list if Cython is unavailable"""
+    if cythonize is None:
+        warnings.warn("Cython not installed - skipping compiled extensions (pure Python modules will be used)")
+        return []
+
+    return cythonize(
+        [os.path.join(SRC_DIR, module) for module in COMPILED_MODULES],
+        # annotation_typing is disabled so that Dict annotations keep accepting
+        # dict subclasses such as psycopg2's RealDictRow
+        compiler_directives={'language_level': 3, 'boundscheck': False, 'annotation_typing': False},
+    )
+
+
+setup(
+    name='byteforge-aegis',
+    package_dir={'': SRC_DIR},
+    ext_modules=get_ext_modules(),
+    zip_safe=False,
+)
@@ -1,10 +1,9 @@
 """
 Admin endpoint to list users for the authenticated admin's site.
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, g, jsonify
 from database import db_manager
 from models.user_role import UserRole
-from schemas.auth_schemas import UserResponseSchema
 from utils.role_middleware import require_role
 
 admin_list_users_bp = Blueprint('admin_list_users', __name__)
@@ -27,7 +26,5 @@ def admin_list_users():
         401: Missing or invalid token
         403: User does not have admin role
     """
-    site_id = request.user.site_id
-    users = db_manager.list_users_by_site(site_id)
-    schema = UserResponseSchema(many=True)
-    return jsonify(schema.dump(users)), 200
+    site_id = g.user.site_id
+    return jsonify(db_manager.list_user_summaries_by_site(site_id)), 200
@@ -5,6 +5,7 @@ from flask import Blueprint, jsonify
 from services.auth_service import auth_service
 from models.user_role import UserRole
 from schemas.auth_schemas import AdminRegisterRequestSchema, UserResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 from utils.api_key_middleware import require_master_api_key
 
@@ -38,13 +39,12 @@ def admin_register(validated_data: dict):
         role_str = validated_data.get('role', 'user')
         role = UserRole.ADMIN if role_str == 'admin' else UserRole.USER
 
-        user = auth_service.register_user(
+        result = auth_service.register_user(
             site_id=validated_data['site_id'],
             email=validated_data['email'],
             password=None,  # User will set password via email verification
             role=role
         )
-        schema = UserResponseSchema()
-        return jsonify(schema.dump(user)), 201
+        return jsonify(serialize(UserResponseSchema, result.user)), 201
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -1,9 +1,10 @@
 """
 Change password endpoint.
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, g, jsonify
 from services.auth_service import auth_service
 from schemas.auth_schemas import ChangePasswordRequestSchema, UserResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 from utils.auth_middleware import require_auth
 
@@ -31,11 +32,10 @@ def change_password(validated_data):
     """
     try:
         user = auth_service.change_password(
-            user_id=request.user_id,
+            user_id=g.user_id,
             old_password=validated_data['old_password'],
             new_password=validated_data['new_password']
         )
-        schema = UserResponseSchema()
-        return jsonify(schema.dump(user)), 200
+        return jsonify(serialize(UserResponseSchema, user)), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
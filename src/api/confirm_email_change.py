@@ -4,6 +4,7 @@ Confirm email change endpoint.
 from flask import Blueprint, jsonify
 from services.auth_service import auth_service
 from schemas.auth_schemas import ConfirmEmailChangeSchema, UserResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 
 confirm_email_change_bp = Blueprint('confirm_email_change', __name__)
@@ -24,7 +25,6 @@ def confirm_email_change(validated_data):
     """
     try:
         user = auth_service.confirm_email_change(validated_data['token'])
-        schema = UserResponseSchema()
-        return jsonify(schema.dump(user)), 200
+        return jsonify(serialize(UserResponseSchema, user)), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -6,6 +6,7 @@ import time
 from database import db_manager
 from models.site import Site
 from schemas.site_schemas import CreateSiteRequestSchema, SiteResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 from utils.api_key_middleware import require_master_api_key
 
@@ -46,8 +47,7 @@ def create_site(validated_data):
 
     try:
         created_site = db_manager.create_site(site)
-        schema = SiteResponseSchema()
-        return jsonify(schema.dump(created_site)), 201
+        return jsonify(serialize(SiteResponseSchema, created_site)), 201
     except Exception as e:
         if 'duplicate' in str(e).lower() or 'unique' in str(e).lower():
             return jsonify({'error': 'Domain already exists'}), 400
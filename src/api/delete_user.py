@@ -3,6 +3,8 @@ Delete user endpoint.
 """
 from flask import Blueprint, jsonify
 from database import db_manager
+from services.token_service import token_service
+from services.auth_service import auth_service
 from utils.api_key_middleware import require_master_api_key
 
 delete_user_bp = Blueprint('delete_user', __name__)
@@ -29,7 +31,11 @@ def delete_user(user_id: int):
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
+    # Revoke sessions first so cached tokens stop working immediately
+    token_service.invalidate_user_tokens(user_id)
+
     deleted = db_manager.delete_user(user_id)
+    auth_service.invalidate_user(user_id)
     if deleted:
         return jsonify({'message': f'User {user_id} deleted successfully'}), 200
     else:
@@ -4,6 +4,7 @@ Get site endpoint.
 from flask import Blueprint, jsonify, request
 from database import db_manager
 from schemas.site_schemas import SiteResponseSchema
+from utils.serializers import serialize
 from utils.api_key_middleware import require_master_api_key
 
 get_site_bp = Blueprint('get_site', __name__)
@@ -32,8 +33,7 @@ def get_site_by_domain():
     if site is None:
         return jsonify({'error': 'Site not found'}), 404
 
-    schema = SiteResponseSchema()
-    return jsonify(schema.dump(site)), 200
+    return jsonify(serialize(SiteResponseSchema, site)), 200
 
 
 @get_site_bp.route('/api/sites/<int:site_id>', methods=['GET'])
@@ -57,5 +57,4 @@ def get_site_by_id(site_id):
     if site is None:
         return jsonify({'error': 'Site not found'}), 404
 
-    schema = SiteResponseSchema()
-    return jsonify(schema.dump(site)), 200
+    return jsonify(serialize(SiteResponseSchema, site)), 200
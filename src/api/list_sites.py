@@ -4,6 +4,7 @@ List all sites endpoint.
 from flask import Blueprint, jsonify
 from database import db_manager
 from schemas.site_schemas import SiteResponseSchema
+from utils.serializers import serialize
 from utils.api_key_middleware import require_master_api_key
 
 list_sites_bp = Blueprint('list_sites', __name__)
@@ -35,6 +36,4 @@ def list_sites():
     # Convert to Site objects and serialize
     from models.site import Site
     sites = [Site.from_dict(row) for row in rows]
-    schema = SiteResponseSchema(many=True)
-
-    return jsonify(schema.dump(sites)), 200
+    return jsonify(serialize(SiteResponseSchema, sites, many=True)), 200
@@ -3,7 +3,6 @@ List users for a site endpoint.
 """
 from flask import Blueprint, jsonify, request
 from database import db_manager
-from schemas.auth_schemas import UserResponseSchema
 from utils.api_key_middleware import require_master_api_key
 
 list_users_bp = Blueprint('list_users', __name__)
@@ -29,9 +28,7 @@ def list_users_by_site_id(site_id: int):
     if site is None:
         return jsonify({'error': 'Site not found'}), 404
 
-    users = db_manager.list_users_by_site(site_id)
-    schema = UserResponseSchema(many=True)
-    return jsonify(schema.dump(users)), 200
+    return jsonify(db_manager.list_user_summaries_by_site(site_id)), 200
 
 
 @list_users_bp.route('/api/sites/by-domain/users', methods=['GET'])
@@ -60,6 +57,4 @@ def list_users_by_domain():
     if site is None:
         return jsonify({'error': 'Site not found'}), 404
 
-    users = db_manager.list_users_by_site(site.id)
-    schema = UserResponseSchema(many=True)
-    return jsonify(schema.dump(users)), 200
+    return jsonify(db_manager.list_user_summaries_by_site(site.id)), 200
@@ -4,6 +4,7 @@ User login endpoint.
 from flask import Blueprint, jsonify
 from services.auth_service import auth_service
 from schemas.auth_schemas import LoginRequestSchema, AuthTokenResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 
 login_bp = Blueprint('login', __name__)
@@ -31,8 +32,7 @@ def login(validated_data):
             email=validated_data['email'],
             password=validated_data['password']
         )
-        schema = AuthTokenResponseSchema()
-        return jsonify(schema.dump(auth_token)), 200
+        return jsonify(serialize(AuthTokenResponseSchema, auth_token)), 200
     except ValueError as e:
         error_msg = str(e).lower()
         if 'not verified' in error_msg:
@@ -1,8 +1,8 @@
 """
 User logout endpoint.
 """
-from flask import Blueprint, jsonify, request
-from database import db_manager
+from flask import Blueprint, g, jsonify
+from services.token_service import token_service
 from utils.auth_middleware import require_auth
 
 logout_bp = Blueprint('logout', __name__)
@@ -22,10 +22,7 @@ def logout():
         401: Missing or invalid token
         404: Token not found
     """
-    auth_header = request.headers.get('Authorization')
-    token = auth_header[7:]  # Remove 'Bearer ' prefix
-
-    deleted = db_manager.delete_auth_token(token)
+    deleted = token_service.invalidate_auth_token(g.auth_token)
 
     if deleted:
         return jsonify({'message': 'Logged out successfully'}), 200
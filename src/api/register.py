@@ -4,6 +4,7 @@ User registration endpoint.
 from flask import Blueprint, jsonify
 from services.auth_service import auth_service
 from schemas.auth_schemas import RegisterRequestSchema, UserResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 
 register_bp = Blueprint('register', __name__)
@@ -25,12 +26,11 @@ def register(validated_data):
         400: Validation error or duplicate email
     """
     try:
-        user = auth_service.register_user(
+        result = auth_service.register_user(
             site_id=validated_data['site_id'],
             email=validated_data['email'],
             password=validated_data['password']
         )
-        schema = UserResponseSchema()
-        return jsonify(schema.dump(user)), 201
+        return jsonify(serialize(UserResponseSchema, result.user)), 201
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -1,7 +1,7 @@
 """
 Request email change endpoint.
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, g, jsonify
 from services.auth_service import auth_service
 from schemas.auth_schemas import RequestEmailChangeSchema
 from utils.validators import validate_request
@@ -30,7 +30,7 @@ def request_email_change(validated_data):
     """
     try:
         auth_service.request_email_change(
-            user_id=request.user_id,
+            user_id=g.user_id,
             new_email=validated_data['new_email']
         )
         return jsonify({'message': 'Email change confirmation sent'}), 200
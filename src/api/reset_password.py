@@ -4,6 +4,7 @@ Reset password endpoint.
 from flask import Blueprint, jsonify
 from services.auth_service import auth_service
 from schemas.auth_schemas import ResetPasswordRequestSchema, UserResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 
 reset_password_bp = Blueprint('reset_password', __name__)
@@ -28,7 +29,6 @@ def reset_password(validated_data):
             token=validated_data['token'],
             new_password=validated_data['new_password']
         )
-        schema = UserResponseSchema()
-        return jsonify(schema.dump(user)), 200
+        return jsonify(serialize(UserResponseSchema, user)), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
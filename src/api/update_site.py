@@ -5,6 +5,7 @@ from flask import Blueprint, jsonify
 import time
 from database import db_manager
 from schemas.site_schemas import UpdateSiteRequestSchema, SiteResponseSchema
+from utils.serializers import serialize
 from utils.validators import validate_request
 from utils.api_key_middleware import require_master_api_key
 
@@ -65,8 +66,7 @@ def update_site(validated_data, site_id):
     # Save to database
     try:
         updated_site = db_manager.update_site(site)
-        schema = SiteResponseSchema()
-        return jsonify(schema.dump(updated_site)), 200
+        return jsonify(serialize(SiteResponseSchema, updated_site)), 200
     except Exception as e:
         if 'duplicate' in str(e).lower() or 'unique' in str(e).lower():
             return jsonify({'error': 'Domain already exists'}), 400
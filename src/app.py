@@ -3,11 +3,13 @@ import logging
 from flask import Flask
 from flask_cors import CORS
 from config import get_config
+from utils.json_provider import OrjsonProvider
 
 
 def create_app() -> Flask:
     """Application factory pattern"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # Configure logging
     logging.basicConfig(
@@ -4,6 +4,32 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def int_setting(name: str, default: int, minimum: int, maximum: int) -> int:
+    """
+    Read an integer environment variable, failing at startup if it is malformed.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is not set
+        minimum: Smallest accepted value
+        maximum: Largest accepted value
+
+    Returns:
+        int: The configured value
+
+    Raises:
+        ValueError: If the value is not an integer or is outside [minimum, maximum]
+    """
+    raw = os.getenv(name, str(default))
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+    if not minimum <= value <= maximum:
+        raise ValueError(f"{name} must be between {minimum} and {maximum}, got {value}")
+    return value
+
+
 class Config:
     """Base configuration"""
     # Flask SECRET_KEY - Not currently used (stateless token-based auth, no sessions/cookies)
@@ -18,12 +44,30 @@ class Config:
     DB_NAME: str = os.getenv('DB_NAME', 'aegis')
     DB_USER: str = os.getenv('DB_USER', 'aegis_admin')
     DB_PASSWORD: str = os.getenv('DB_PASSWORD', 'aegis_admin')
+    # Connections kept open per worker process (shared by the worker's threads)
+    DB_POOL_MIN_CONN: int = int(os.getenv('DB_POOL_MIN_CONN', 1))
+    DB_POOL_MAX_CONN: int = int(os.getenv('DB_POOL_MAX_CONN', 10))
+
+    # Email provider: 'mailgun', 'sendgrid', or 'none' (disable email delivery)
+    EMAIL_PROVIDER: str = os.getenv('EMAIL_PROVIDER', 'mailgun')
 
     # Mailgun
     MAILGUN_API_KEY: str = os.getenv('MAILGUN_API_KEY', '')
     MAILGUN_DOMAIN: str = os.getenv('MAILGUN_DOMAIN', '')
+
+    # SendGrid
+    SENDGRID_API_KEY: str = os.getenv('SENDGRID_API_KEY', '')
     EMAIL_FROM: str = os.getenv('EMAIL_FROM', 'noreply@example.com')
     EMAIL_FROM_NAME: str = os.getenv('EMAIL_FROM_NAME', 'ByteForge Aegis')
+    # Number of background threads sending transactional emails
+    EMAIL_SEND_WORKERS: int = int(os.getenv('EMAIL_SEND_WORKERS', 4))
+    # Most emails waiting or sending at once (per process); further emails are dropped and logged
+    EMAIL_SEND_QUEUE_SIZE: int = int(os.getenv('EMAIL_SEND_QUEUE_SIZE', 1000))
+    # Most provider API calls allowed in flight at once (per process)
+    MAX_CONCURRENT_SENDS: int = int(os.getenv('MAX_CONCURRENT_SENDS', 10))
+
+    # Password hashing - bcrypt cost factor (log2 of the number of rounds, 4-31)
+    BCRYPT_ROUNDS: int = int_setting('BCRYPT_ROUNDS', 12, 4, 31)
 
     # Token Expiration (seconds)
     AUTH_TOKEN_EXPIRATION: int = int(os.getenv('AUTH_TOKEN_EXPIRATION', 3600))
@@ -31,6 +75,16 @@ class Config:
     PASSWORD_RESET_EXPIRATION: int = int(os.getenv('PASSWORD_RESET_EXPIRATION', 3600))
     EMAIL_CHANGE_EXPIRATION: int = int(os.getenv('EMAIL_CHANGE_EXPIRATION', 3600))
 
+    # Auth token validation cache (per process). Logged-out tokens may keep working
+    # in other worker processes for up to AUTH_TOKEN_CACHE_TTL seconds; 0 disables
+    AUTH_TOKEN_CACHE_TTL: int = int(os.getenv('AUTH_TOKEN_CACHE_TTL', 30))
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv('AUTH_TOKEN_CACHE_SIZE', 10000))
+
+    # User lookup cache for authorized requests (per process). Role changes made through
+    # another worker process take up to USER_CACHE_TTL seconds to apply; 0 disables
+    USER_CACHE_TTL: int = int(os.getenv('USER_CACHE_TTL', 30))
+    USER_CACHE_SIZE: int = int(os.getenv('USER_CACHE_SIZE', 10000))
+
     # Application
     APP_HOST: str = os.getenv('APP_HOST', '0.0.0.0')
     APP_PORT: int = int(os.getenv('APP_PORT', 5678))
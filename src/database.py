@@ -1,8 +1,8 @@
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from contextlib import contextmanager
-from typing import Generator, List, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
 from models.user import User
 from config import get_config
 
@@ -10,11 +10,11 @@ from config import get_config
 class DatabaseManager:
     """Manages PostgreSQL database connections with connection pooling"""
 
-    def __init__(self, min_conn: int = 1, max_conn: int = 10):
+    def __init__(self, min_conn: Optional[int] = None, max_conn: Optional[int] = None):
         self.config = get_config()
         self.connection_pool = None
-        self.min_conn = min_conn
-        self.max_conn = max_conn
+        self.min_conn = min_conn if min_conn is not None else self.config.DB_POOL_MIN_CONN
+        self.max_conn = max_conn if max_conn is not None else self.config.DB_POOL_MAX_CONN
         self._pool_initialized = False
 
         # Try to initialize, but don't fail if database isn't available yet
@@ -26,7 +26,8 @@ class DatabaseManager:
             return True
 
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
+            # Threaded pool: connections are shared by every request thread in the worker
+            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
                 self.min_conn,
                 self.max_conn,
                 host=self.config.DB_HOST,
@@ -69,12 +70,20 @@ class DatabaseManager:
         try:
             yield conn
         finally:
-            self.connection_pool.putconn(conn)
+            # Broken connections are dropped so the pool opens a fresh one
+            self.connection_pool.putconn(conn, close=bool(conn.closed))
 
     @contextmanager
     def get_cursor(self, commit: bool = False) -> Generator:
-        """Context manager for getting a cursor with automatic commit/rollback"""
+        """
+        Context manager for getting a cursor with automatic commit/rollback.
+
+        Read-only cursors (commit=False) run in autocommit mode: each query is its own
+        transaction, so there is no extra BEGIN round-trip and the connection is not
+        returned to the pool idle in a transaction.
+        """
         with self.get_connection() as conn:
+            conn.autocommit = not commit
             cursor = conn.cursor(cursor_factory=RealDictCursor)
             try:
                 yield cursor
@@ -193,6 +202,38 @@ class DatabaseManager:
             user.id = cursor.fetchone()['id']
         return user
 
+    def create_users(self, users: List['User']) -> List['User']:
+        """
+        Create many users with a single multi-row INSERT.
+
+        Args:
+            users: User models with site_id, email, password_hash, is_verified, role, created_at, updated_at
+
+        Returns:
+            List[User]: The created users with auto-generated ids
+        """
+        if not users:
+            return users
+
+        with self.get_cursor(commit=True) as cursor:
+            rows = execute_values(
+                cursor,
+                """
+                INSERT INTO users (site_id, email, password_hash, is_verified, role, created_at, updated_at)
+                VALUES %s
+                RETURNING id, site_id, email
+                """,
+                [(u.site_id, u.email, u.password_hash, u.is_verified, u.role.value, u.created_at, u.updated_at) for u in users],
+                page_size=len(users),
+                fetch=True
+            )
+
+        # (site_id, email) is unique, so match ids without relying on RETURNING order
+        ids = {(row['site_id'], row['email']): row['id'] for row in rows}
+        for user in users:
+            user.id = ids[(user.site_id, user.email)]
+        return users
+
     def find_user_by_id(self, user_id: int) -> Optional['User']:
         """
         Find a user by their ID.
@@ -234,23 +275,55 @@ class DatabaseManager:
             row = cursor.fetchone()
             return User.from_dict(row) if row else None
 
-    def list_users_by_site(self, site_id: int) -> List[User]:
+    def find_user_by_auth_token(self, token: str) -> Optional[Tuple['User', int]]:
         """
-        List all users for a specific site.
+        Find the user an auth token belongs to, in a single query.
+
+        Args:
+            token: The auth token string
+
+        Returns:
+            Optional[Tuple[User, int]]: The user and the token's expires_at, or None if the token does not exist
+        """
+        from models.user import User
+
+        with self.get_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT u.id, u.site_id, u.email, u.password_hash, u.is_verified, u.role, u.created_at, u.updated_at,
+                       a.expires_at AS token_expires_at
+                FROM auth_tokens a
+                JOIN users u ON u.id = a.user_id
+                WHERE a.token = %s
+                """,
+                (token,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            expires_at = row.pop('token_expires_at')
+            return User.from_dict(row), expires_at
+
+    def list_user_summaries_by_site(self, site_id: int) -> List[Dict[str, Any]]:
+        """
+        List all users for a specific site as response-ready dicts.
+
+        Selects only the public user fields (never password_hash), with role as its
+        string value, so list endpoints can return the rows without building User
+        models or running a response schema.
 
         Args:
             site_id: The ID of the site
 
         Returns:
-            List of User models
+            List[Dict[str, Any]]: One dict per user with the UserResponseSchema fields
         """
         with self.get_cursor() as cursor:
             cursor.execute(
-                "SELECT id, site_id, email, password_hash, is_verified, role, created_at, updated_at FROM users WHERE site_id = %s ORDER BY id",
+                "SELECT id, site_id, email, is_verified, role, created_at, updated_at FROM users WHERE site_id = %s ORDER BY id",
                 (site_id,)
             )
-            rows = cursor.fetchall()
-            return [User.from_dict(row) for row in rows]
+            return cursor.fetchall()
 
     def update_user(self, user: 'User') -> 'User':
         """
@@ -315,6 +388,28 @@ class DatabaseManager:
             )
         return auth_token
 
+    def create_auth_tokens(self, auth_tokens: List['AuthToken']) -> List['AuthToken']:
+        """
+        Create many auth tokens with a single multi-row INSERT.
+
+        Args:
+            auth_tokens: AuthToken models with all fields
+
+        Returns:
+            List[AuthToken]: The created auth tokens
+        """
+        if not auth_tokens:
+            return auth_tokens
+
+        with self.get_cursor(commit=True) as cursor:
+            execute_values(
+                cursor,
+                "INSERT INTO auth_tokens (site_id, user_id, token, expires_at, created_at) VALUES %s",
+                [(t.site_id, t.user_id, t.token, t.expires_at, t.created_at) for t in auth_tokens],
+                page_size=len(auth_tokens)
+            )
+        return auth_tokens
+
     def find_auth_token_by_token(self, token: str) -> Optional['AuthToken']:
         """
         Find an auth token by its token string.
@@ -363,20 +458,6 @@ class DatabaseManager:
             cursor.execute("DELETE FROM auth_tokens WHERE user_id = %s", (user_id,))
             return cursor.rowcount
 
-    def delete_expired_auth_tokens(self, current_time: int) -> int:
-        """
-        Delete all expired auth tokens.
-
-        Args:
-            current_time: Unix timestamp to compare against
-
-        Returns:
-            int: Number of tokens deleted
-        """
-        with self.get_cursor(commit=True) as cursor:
-            cursor.execute("DELETE FROM auth_tokens WHERE expires_at < %s", (current_time,))
-            return cursor.rowcount
-
     # EmailVerificationToken operations
     def create_email_verification_token(self, token: 'EmailVerificationToken') -> 'EmailVerificationToken':
         """
@@ -418,33 +499,30 @@ class DatabaseManager:
             row = cursor.fetchone()
             return EmailVerificationToken.from_dict(row) if row else None
 
-    def delete_email_verification_token(self, token: str) -> bool:
+    def consume_email_verification_token(self, token: str, current_time: int) -> Optional['EmailVerificationToken']:
         """
-        Delete an email verification token.
+        Atomically delete an unexpired email verification token and return it.
 
         Args:
-            token: The token string to delete
+            token: The token string to consume
+            current_time: Unix timestamp; tokens expiring before this are not consumed
 
         Returns:
-            bool: True if deleted, False if not found
+            Optional[EmailVerificationToken]: The consumed token, or None if not found or expired
         """
-        with self.get_cursor(commit=True) as cursor:
-            cursor.execute("DELETE FROM email_verification_tokens WHERE token = %s", (token,))
-            return cursor.rowcount > 0
-
-    def delete_expired_email_verification_tokens(self, current_time: int) -> int:
-        """
-        Delete all expired email verification tokens.
-
-        Args:
-            current_time: Unix timestamp to compare against
+        from models.email_verification_token import EmailVerificationToken
 
-        Returns:
-            int: Number of tokens deleted
-        """
         with self.get_cursor(commit=True) as cursor:
-            cursor.execute("DELETE FROM email_verification_tokens WHERE expires_at < %s", (current_time,))
-            return cursor.rowcount
+            cursor.execute(
+                """
+                DELETE FROM email_verification_tokens
+                WHERE token = %s AND expires_at >= %s
+                RETURNING site_id, user_id, token, expires_at, created_at
+                """,
+                (token, current_time)
+            )
+            row = cursor.fetchone()
+            return EmailVerificationToken.from_dict(row) if row else None
 
     # PasswordResetToken operations
     def create_password_reset_token(self, token: 'PasswordResetToken') -> 'PasswordResetToken':
@@ -487,33 +565,31 @@ class DatabaseManager:
             row = cursor.fetchone()
             return PasswordResetToken.from_dict(row) if row else None
 
-    def mark_password_reset_token_used(self, token: str) -> bool:
+    def consume_password_reset_token(self, token: str, current_time: int) -> Optional['PasswordResetToken']:
         """
-        Mark a password reset token as used.
+        Atomically mark an unused, unexpired password reset token as used and return it.
 
         Args:
-            token: The token string to mark as used
+            token: The token string to consume
+            current_time: Unix timestamp; tokens expiring before this are not consumed
 
         Returns:
-            bool: True if updated, False if not found
-        """
-        with self.get_cursor(commit=True) as cursor:
-            cursor.execute("UPDATE password_reset_tokens SET used = TRUE WHERE token = %s", (token,))
-            return cursor.rowcount > 0
-
-    def delete_expired_password_reset_tokens(self, current_time: int) -> int:
+            Optional[PasswordResetToken]: The consumed token, or None if not found, expired, or already used
         """
-        Delete all expired password reset tokens.
-
-        Args:
-            current_time: Unix timestamp to compare against
+        from models.password_reset_token import PasswordResetToken
 
-        Returns:
-            int: Number of tokens deleted
-        """
         with self.get_cursor(commit=True) as cursor:
-            cursor.execute("DELETE FROM password_reset_tokens WHERE expires_at < %s", (current_time,))
-            return cursor.rowcount
+            cursor.execute(
+                """
+                UPDATE password_reset_tokens
+                SET used = TRUE
+                WHERE token = %s AND used = FALSE AND expires_at >= %s
+                RETURNING site_id, user_id, token, expires_at, created_at, used
+                """,
+                (token, current_time)
+            )
+            row = cursor.fetchone()
+            return PasswordResetToken.from_dict(row) if row else None
 
     # EmailChangeRequest operations
     def create_email_change_request(self, request: 'EmailChangeRequest') -> 'EmailChangeRequest':
@@ -536,53 +612,60 @@ class DatabaseManager:
             )
         return request
 
-    def find_email_change_request(self, token: str) -> Optional['EmailChangeRequest']:
+    def consume_email_change_request(self, token: str, current_time: int) -> Optional['EmailChangeRequest']:
         """
-        Find an email change request by its token string.
+        Atomically delete an unexpired email change request and return it.
 
         Args:
-            token: The token string to search for
+            token: The token string to consume
+            current_time: Unix timestamp; requests expiring before this are not consumed
 
         Returns:
-            Optional[EmailChangeRequest]: The request if found, None otherwise
+            Optional[EmailChangeRequest]: The consumed request, or None if not found or expired
         """
         from models.email_change_request import EmailChangeRequest
 
-        with self.get_cursor() as cursor:
+        with self.get_cursor(commit=True) as cursor:
             cursor.execute(
-                "SELECT site_id, user_id, new_email, token, expires_at, created_at FROM email_change_requests WHERE token = %s",
-                (token,)
+                """
+                DELETE FROM email_change_requests
+                WHERE token = %s AND expires_at >= %s
+                RETURNING site_id, user_id, new_email, token, expires_at, created_at
+                """,
+                (token, current_time)
             )
             row = cursor.fetchone()
             return EmailChangeRequest.from_dict(row) if row else None
 
-    def delete_email_change_request(self, token: str) -> bool:
-        """
-        Delete an email change request.
-
-        Args:
-            token: The token string to delete
-
-        Returns:
-            bool: True if deleted, False if not found
-        """
-        with self.get_cursor(commit=True) as cursor:
-            cursor.execute("DELETE FROM email_change_requests WHERE token = %s", (token,))
-            return cursor.rowcount > 0
-
-    def delete_expired_email_change_requests(self, current_time: int) -> int:
+    # Maintenance operations
+    def delete_all_expired_tokens(self, current_time: int) -> int:
         """
-        Delete all expired email change requests.
+        Delete all expired auth tokens, email verification tokens, password reset
+        tokens and email change requests in a single statement and transaction.
 
         Args:
             current_time: Unix timestamp to compare against
 
         Returns:
-            int: Number of requests deleted
+            int: Total number of rows deleted
         """
         with self.get_cursor(commit=True) as cursor:
-            cursor.execute("DELETE FROM email_change_requests WHERE expires_at < %s", (current_time,))
-            return cursor.rowcount
+            cursor.execute(
+                """
+                WITH
+                    auth AS (DELETE FROM auth_tokens WHERE expires_at < %(now)s RETURNING 1),
+                    verification AS (DELETE FROM email_verification_tokens WHERE expires_at < %(now)s RETURNING 1),
+                    reset AS (DELETE FROM password_reset_tokens WHERE expires_at < %(now)s RETURNING 1),
+                    email_change AS (DELETE FROM email_change_requests WHERE expires_at < %(now)s RETURNING 1)
+                SELECT
+                    (SELECT COUNT(*) FROM auth)
+                    + (SELECT COUNT(*) FROM verification)
+                    + (SELECT COUNT(*) FROM reset)
+                    + (SELECT COUNT(*) FROM email_change) AS deleted
+                """,
+                {'now': current_time}
+            )
+            return cursor.fetchone()['deleted']
 
 
 # Global database manager instance
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthToken:
     """
     Authentication token model for managing user sessions.
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailVerificationToken:
     """
     Email verification token model for confirming user email ownership.
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Dict, Any
+from models.user import User
+
+
+@dataclass(slots=True)
+class RegistrationResult:
+    """
+    Result of user registration containing the new user and their verification token.
+
+    Attributes:
+        user: The newly registered (unverified) user
+        verification_token: The email verification token sent to the user
+    """
+    user: User
+    verification_token: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert registration result to dictionary"""
+        return {
+            'user': self.user.to_dict(),
+            'verification_token': self.verification_token
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RegistrationResult':
+        """Create registration result from dictionary"""
+        return cls(
+            user=User.from_dict(data['user']),
+            verification_token=data['verification_token']
+        )
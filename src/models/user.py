@@ -3,7 +3,7 @@ from typing import Dict, Any, Optional
 from models.user_role import UserRole
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """
     User model representing a registered user account.
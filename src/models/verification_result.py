@@ -3,7 +3,7 @@ from typing import Dict, Any
 from models.user import User
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """
     Result of email verification containing user and redirect URL.
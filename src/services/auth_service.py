@@ -1,23 +1,28 @@
 import time
-import logging
 from typing import Optional
 from database import db_manager
+from config import get_config
 from models.user import User
 from models.user_role import UserRole
 from models.auth_token import AuthToken
 from models.verification_result import VerificationResult
+from models.registration_result import RegistrationResult
 from models.verification_token_status import VerificationTokenStatus
 from services.password_service import password_service
 from services.token_service import token_service
 from services.email_service import email_service
-
-logger = logging.getLogger(__name__)
+from utils.ttl_cache import TTLCache
 
 
 class AuthService:
     """Service for user authentication and account management"""
 
-    def register_user(self, site_id: int, email: str, password: Optional[str], role: UserRole = UserRole.USER) -> User:
+    def __init__(self):
+        config = get_config()
+        # user_id -> User for authorized request lookups
+        self.user_cache = TTLCache(maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+
+    def register_user(self, site_id: int, email: str, password: Optional[str], role: UserRole = UserRole.USER) -> RegistrationResult:
         """
         Register a new user account for a specific site.
 
@@ -31,7 +36,7 @@ class AuthService:
             role: The user's role (defaults to USER)
 
         Returns:
-            User: The created user model
+            RegistrationResult: The created user model and its email verification token
 
         Raises:
             ValueError: If email already exists for this site
@@ -65,19 +70,17 @@ class AuthService:
         # Get site info for email
         site = db_manager.find_site_by_id(site_id)
         if site:
-            # Send verification email (don't fail if email fails)
-            try:
-                email_service.send_verification_email(
-                    to_email=user.email,
-                    token=verification_token.token,
-                    site_name=site.name,
-                    from_email=site.email_from,
-                    from_name=site.email_from_name
-                )
-            except Exception as e:
-                logger.error(f"Failed to send verification email: {str(e)}")
-
-        return user
+            # Send verification email in the background (failures are logged, not raised)
+            email_service.enqueue(
+                email_service.send_verification_email,
+                to_email=user.email,
+                token=verification_token.token,
+                site_name=site.name,
+                from_email=site.email_from,
+                from_name=site.email_from_name
+            )
+
+        return RegistrationResult(user=user, verification_token=verification_token.token)
 
     def login(self, site_id: int, email: str, password: str) -> AuthToken:
         """
@@ -196,7 +199,7 @@ class AuthService:
         user.is_verified = True
         user.updated_at = int(time.time())
 
-        updated_user = db_manager.update_user(user)
+        updated_user = self._update_user(user)
 
         return VerificationResult(
             user=updated_user,
@@ -267,7 +270,7 @@ class AuthService:
         user.updated_at = int(time.time())
 
         # Update user
-        updated_user = db_manager.update_user(user)
+        updated_user = self._update_user(user)
 
         # Invalidate all existing auth tokens for security
         token_service.invalidate_user_tokens(user_id)
@@ -295,18 +298,16 @@ class AuthService:
         # Get site info for email
         site = db_manager.find_site_by_id(site_id)
         if site:
-            # Send password reset email (don't fail if email fails)
-            try:
-                email_service.send_password_reset_email(
-                    to_email=user.email,
-                    token=reset_token.token,
-                    site_name=site.name,
-                    frontend_url=site.frontend_url,
-                    from_email=site.email_from,
-                    from_name=site.email_from_name
-                )
-            except Exception as e:
-                logger.error(f"Failed to send password reset email: {str(e)}")
+            # Send password reset email in the background (failures are logged, not raised)
+            email_service.enqueue(
+                email_service.send_password_reset_email,
+                to_email=user.email,
+                token=reset_token.token,
+                site_name=site.name,
+                frontend_url=site.frontend_url,
+                from_email=site.email_from,
+                from_name=site.email_from_name
+            )
 
         return reset_token.token
 
@@ -337,7 +338,7 @@ class AuthService:
         user.updated_at = int(time.time())
 
         # Update user
-        updated_user = db_manager.update_user(user)
+        updated_user = self._update_user(user)
 
         # Invalidate all existing auth tokens for security
         token_service.invalidate_user_tokens(user_id)
@@ -372,18 +373,16 @@ class AuthService:
         # Get site info for email
         site = db_manager.find_site_by_id(user.site_id)
         if site:
-            # Send email change confirmation (don't fail if email fails)
-            try:
-                email_service.send_email_change_confirmation(
-                    to_email=new_email,
-                    token=change_request.token,
-                    site_name=site.name,
-                    frontend_url=site.frontend_url,
-                    from_email=site.email_from,
-                    from_name=site.email_from_name
-                )
-            except Exception as e:
-                logger.error(f"Failed to send email change confirmation: {str(e)}")
+            # Send email change confirmation in the background (failures are logged, not raised)
+            email_service.enqueue(
+                email_service.send_email_change_confirmation,
+                to_email=new_email,
+                token=change_request.token,
+                site_name=site.name,
+                frontend_url=site.frontend_url,
+                from_email=site.email_from,
+                from_name=site.email_from_name
+            )
 
         return change_request.token
 
@@ -412,23 +411,67 @@ class AuthService:
         user.email = change_request.new_email
         user.updated_at = int(time.time())
 
-        return db_manager.update_user(user)
+        return self._update_user(user)
 
     def get_user_by_token(self, token: str) -> Optional[User]:
         """
         Get a user by their auth token.
 
+        Served from the token and user caches when possible; otherwise the token
+        and its user are loaded with a single query.
+
         Args:
             token: The auth token
 
         Returns:
             Optional[User]: The user if token is valid, None otherwise
         """
-        user_id = token_service.validate_auth_token(token)
-        if not user_id:
+        user_id, user = token_service.validate_auth_token_with_user(token)
+        if user_id is None:
             return None
 
-        return db_manager.find_user_by_id(user_id)
+        if user is None:
+            return self.get_user(user_id)
+
+        self.user_cache.set(user.id, user)
+
+        return user
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        """
+        Get a user by ID, served from the user cache when possible.
+
+        Returned users may be shared between requests and must not be modified.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            Optional[User]: The user if found, None otherwise
+        """
+        user = self.user_cache.get(user_id)
+        if user is not None:
+            return user
+
+        user = db_manager.find_user_by_id(user_id)
+        if user:
+            self.user_cache.set(user_id, user)
+        return user
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop a user from the user cache after it changes outside this service.
+
+        Args:
+            user_id: The user's ID
+        """
+        self.user_cache.pop(user_id)
+
+    def _update_user(self, user: User) -> User:
+        """Save a user and drop its stale cache entry"""
+        updated_user = db_manager.update_user(user)
+        self.user_cache.pop(user.id)
+        return updated_user
 
 
 # Global auth service instance
@@ -0,0 +1,309 @@
+"""
+Email delivery providers (Mailgun, SendGrid) used by the email service.
+"""
+import logging
+import threading
+import requests
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config, get_config
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds - fail fast when the provider is unreachable
+# rather than holding the calling worker for the full read timeout
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Retry policy for transient provider failures (exponential backoff with jitter)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 1.0
+MAX_BACKOFF = 30
+BACKOFF_JITTER = 0.5
+# Only responses that guarantee the message was not accepted: 500/502/504 may arrive after
+# the provider queued the email, so resending them could deliver it twice
+RETRY_STATUS_CODES = (429, 503)
+# Longest Retry-After we wait out; longer waits fail the send instead of holding a send slot
+MAX_RETRY_AFTER = MAX_BACKOFF
+
+
+@lru_cache(maxsize=256)
+def format_sender(from_name: str, from_email: str) -> str:
+    """
+    Format a sender as "Name <address>".
+
+    Senders are per-site settings, so the same few strings are reused across sends.
+
+    Args:
+        from_name: Sender display name
+        from_email: Sender email address
+
+    Returns:
+        str: The formatted sender address
+    """
+    return f"{from_name} <{from_email}>"
+
+
+class EmailProvider(ABC):
+    """Interface for services that deliver a single email"""
+
+    name: str = 'email provider'
+
+    @property
+    @abstractmethod
+    def is_configured(self) -> bool:
+        """Whether the provider has the credentials it needs to send"""
+
+    @abstractmethod
+    def send(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_email: str,
+        from_name: str,
+        text_content: Optional[str] = None
+    ) -> bool:
+        """
+        Send an email.
+
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            html_content: HTML content of the email
+            from_email: Sender email address
+            from_name: Sender display name
+            text_content: Plain text content (optional)
+
+        Returns:
+            bool: True if email sent successfully, False otherwise
+        """
+
+
+class HTTPEmailProvider(EmailProvider):
+    """
+    Base class for providers with an HTTP API.
+
+    Holds a pooled requests.Session so that emails reuse keep-alive connections
+    instead of paying a new TCP + TLS handshake per message.
+    """
+
+    api_url: str = ''
+    success_status_codes: tuple = (200,)
+
+    def __init__(self):
+        self.session = requests.Session()
+        # Caps in-flight API calls so bursts queue locally instead of tripping provider rate limits
+        self.send_slots = threading.BoundedSemaphore(get_config().MAX_CONCURRENT_SENDS)
+        # Transient failures (connection errors, 429 and 503 responses) are retried with
+        # backoff. Read errors and other 5xx responses are not retried since the provider
+        # may already have accepted the message, and retrying would send a duplicate email.
+        retry = Retry(
+            total=MAX_RETRIES,
+            connect=MAX_RETRIES,
+            read=0,
+            status=MAX_RETRIES,
+            backoff_factor=BACKOFF_FACTOR,
+            backoff_max=MAX_BACKOFF,
+            backoff_jitter=BACKOFF_JITTER,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            retry_after_max=MAX_RETRY_AFTER,
+            raise_on_status=False
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry))
+
+    @abstractmethod
+    def build_request(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_email: str,
+        from_name: str,
+        text_content: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Build the keyword arguments for the provider API POST request.
+
+        Returns:
+            Dict[str, Any]: Keyword arguments for requests.Session.post (auth, data, json, headers)
+        """
+
+    def send(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_email: str,
+        from_name: str,
+        text_content: Optional[str] = None
+    ) -> bool:
+        """Send an email through the provider's HTTP API"""
+        logger.info("Attempting to send email to %s from %s via %s", to_email, from_email, self.name)
+        logger.debug("Subject: %s", subject)
+
+        try:
+            request_kwargs = self.build_request(to_email, subject, html_content, from_email, from_name, text_content)
+
+            with self.send_slots:
+                response = self.session.post(self.api_url, timeout=REQUEST_TIMEOUT, **request_kwargs)
+
+            if response.status_code in self.success_status_codes:
+                logger.info("✓ Email sent successfully to %s (Status: %s)", to_email, response.status_code)
+                # Raw body only, and only when debug logging is on - no decoding on the hot path
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("%s response: %r", self.name, response.content)
+                return True
+            else:
+                logger.error("✗ Failed to send email. Status: %s, Body: %s", response.status_code, response.text)
+                return False
+
+        except requests.exceptions.Timeout:
+            logger.error("✗ Timeout sending email to %s", to_email, exc_info=True)
+            return False
+        except requests.exceptions.RequestException as e:
+            logger.error("✗ Request error sending email to %s: %s", to_email, e, exc_info=True)
+            return False
+        except Exception as e:
+            logger.error("✗ Error sending email to %s: %s", to_email, e, exc_info=True)
+            return False
+
+
+class MailgunProvider(HTTPEmailProvider):
+    """Send emails through the Mailgun messages API"""
+
+    name = 'Mailgun'
+
+    def __init__(self, api_key: str, domain: str):
+        super().__init__()
+        self.api_key = api_key
+        self.domain = domain
+        self.api_url = f"https://api.mailgun.net/v3/{domain}/messages"
+        self.auth = ("api", api_key)
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.api_key and self.domain)
+
+    def build_request(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_email: str,
+        from_name: str,
+        text_content: Optional[str]
+    ) -> Dict[str, Any]:
+        data = {
+            "from": format_sender(from_name, from_email),
+            "to": to_email,
+            "subject": subject,
+            "html": html_content
+        }
+
+        if text_content:
+            data["text"] = text_content
+
+        return {'auth': self.auth, 'data': data}
+
+
+class SendGridProvider(HTTPEmailProvider):
+    """Send emails through the SendGrid v3 mail send API"""
+
+    name = 'SendGrid'
+    api_url = "https://api.sendgrid.com/v3/mail/send"
+    success_status_codes = (200, 202)
+
+    def __init__(self, api_key: str):
+        super().__init__()
+        self.api_key = api_key
+        self.headers = {'Authorization': f"Bearer {api_key}"}
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.api_key)
+
+    def build_request(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_email: str,
+        from_name: str,
+        text_content: Optional[str]
+    ) -> Dict[str, Any]:
+        # SendGrid requires text/plain to come before text/html
+        content = []
+        if text_content:
+            content.append({'type': 'text/plain', 'value': text_content})
+        content.append({'type': 'text/html', 'value': html_content})
+
+        payload = {
+            'personalizations': [{'to': [{'email': to_email}]}],
+            'from': {'email': from_email, 'name': from_name},
+            'subject': subject,
+            'content': content
+        }
+
+        return {'headers': self.headers, 'json': payload}
+
+
+class NullProvider(EmailProvider):
+    """Provider that discards every email (email delivery disabled)"""
+
+    name = 'Null'
+
+    @property
+    def is_configured(self) -> bool:
+        return True
+
+    def send(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_email: str,
+        from_name: str,
+        text_content: Optional[str] = None
+    ) -> bool:
+        """Drop the email, reporting it as not sent"""
+        logger.info("Email delivery disabled - not sending '%s' to %s", subject, to_email)
+        return False
+
+
+def create_email_provider(config: Config) -> EmailProvider:
+    """
+    Create the email provider selected by EMAIL_PROVIDER.
+
+    Credentials are checked once here rather than on every send: a provider
+    without them is replaced by a NullProvider that drops emails.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        EmailProvider: The configured provider
+
+    Raises:
+        ValueError: If EMAIL_PROVIDER is not a known provider
+    """
+    provider = config.EMAIL_PROVIDER.lower()
+
+    if provider == 'mailgun':
+        email_provider = MailgunProvider(api_key=config.MAILGUN_API_KEY, domain=config.MAILGUN_DOMAIN)
+    elif provider == 'sendgrid':
+        email_provider = SendGridProvider(api_key=config.SENDGRID_API_KEY)
+    elif provider == 'none':
+        return NullProvider()
+    else:
+        raise ValueError(f"Unknown EMAIL_PROVIDER '{config.EMAIL_PROVIDER}' (expected mailgun, sendgrid or none)")
+
+    if not email_provider.is_configured:
+        logger.error("✗ %s credentials not configured - email delivery disabled", email_provider.name)
+        return NullProvider()
+
+    return email_provider
@@ -1,25 +1,157 @@
 """
-Email service for sending transactional emails using Mailgun.
+Email service for sending transactional emails through the configured email provider.
 """
-import requests
+import html
+import threading
+from string import Template
+from concurrent.futures import Future, ThreadPoolExecutor
 from config import get_config
-from typing import Optional
+from services.email_providers import EmailProvider, create_email_provider
+from typing import Any, Callable, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Email bodies are built once at import time; only the substitution runs per email.
+# Values substituted into the HTML templates must be HTML-escaped by the caller.
+VERIFICATION_HTML = Template("""
+        <html>
+            <body>
+                <h2>Welcome to $site_name!</h2>
+                <p>Please verify your email address by clicking the link below:</p>
+                <p><a href="$url">Verify Email</a></p>
+                <p>Or copy and paste this URL into your browser:</p>
+                <p>$url</p>
+                <p>This link will expire in 24 hours.</p>
+                <p>If you didn't create an account, you can safely ignore this email.</p>
+            </body>
+        </html>
+        """)
+
+VERIFICATION_TEXT = Template("""
+        Welcome to $site_name!
+
+        Please verify your email address by visiting this URL:
+        $url
+
+        This link will expire in 24 hours.
+
+        If you didn't create an account, you can safely ignore this email.
+        """)
+
+PASSWORD_RESET_HTML = Template("""
+        <html>
+            <body>
+                <h2>Password Reset Request</h2>
+                <p>We received a request to reset your password for $site_name.</p>
+                <p>Click the link below to reset your password:</p>
+                <p><a href="$url">Reset Password</a></p>
+                <p>Or copy and paste this URL into your browser:</p>
+                <p>$url</p>
+                <p>This link will expire in 1 hour.</p>
+                <p>If you didn't request a password reset, you can safely ignore this email.</p>
+            </body>
+        </html>
+        """)
+
+PASSWORD_RESET_TEXT = Template("""
+        Password Reset Request
+
+        We received a request to reset your password for $site_name.
+
+        Visit this URL to reset your password:
+        $url
+
+        This link will expire in 1 hour.
+
+        If you didn't request a password reset, you can safely ignore this email.
+        """)
+
+EMAIL_CHANGE_HTML = Template("""
+        <html>
+            <body>
+                <h2>Email Change Confirmation</h2>
+                <p>You requested to change your email address for $site_name.</p>
+                <p>Click the link below to confirm this change:</p>
+                <p><a href="$url">Confirm Email Change</a></p>
+                <p>Or copy and paste this URL into your browser:</p>
+                <p>$url</p>
+                <p>This link will expire in 24 hours.</p>
+                <p>If you didn't request this change, please ignore this email and contact support immediately.</p>
+            </body>
+        </html>
+        """)
+
+EMAIL_CHANGE_TEXT = Template("""
+        Email Change Confirmation
+
+        You requested to change your email address for $site_name.
+
+        Visit this URL to confirm this change:
+        $url
+
+        This link will expire in 24 hours.
+
+        If you didn't request this change, please ignore this email and contact support immediately.
+        """)
+
 
 class EmailService:
-    """Service for sending emails via Mailgun"""
+    """Service for sending emails via the configured provider (Mailgun or SendGrid)"""
+
+    def __init__(self, provider: Optional[EmailProvider] = None):
+        """
+        Initialize the email service.
 
-    def __init__(self):
-        """Initialize the email service with Mailgun API key and domain from config"""
+        Args:
+            provider: Email provider to send through (defaults to the one selected by EMAIL_PROVIDER)
+        """
         config = get_config()
-        self.api_key = config.MAILGUN_API_KEY
-        self.domain = config.MAILGUN_DOMAIN
-        self.api_url = f"https://api.mailgun.net/v3/{self.domain}/messages"
+        self.provider = provider or create_email_provider(config)
         self.aegis_frontend_url = config.AEGIS_FRONTEND_URL.rstrip('/')
 
+        # Background senders so request handlers don't wait on the email provider
+        self.executor = ThreadPoolExecutor(max_workers=config.EMAIL_SEND_WORKERS, thread_name_prefix="email")
+        # The executor's own queue is unbounded; cap queued + in-progress sends so a provider
+        # outage (sends stuck in retries) can't grow memory without limit
+        self.queue_slots = threading.BoundedSemaphore(config.EMAIL_SEND_QUEUE_SIZE)
+
+    def enqueue(self, send_func: Callable[..., bool], **kwargs: Any) -> Future:
+        """
+        Queue an email to be sent on a background thread.
+
+        Args:
+            send_func: One of the send_* methods of this service
+            **kwargs: Keyword arguments for send_func
+
+        If EMAIL_SEND_QUEUE_SIZE emails are already queued or sending, the email is
+        dropped and logged instead of queued.
+
+        Returns:
+            Future: Resolves to True if the email was sent successfully, False otherwise
+        """
+        if not self.queue_slots.acquire(blocking=False):
+            logger.error("✗ Email send queue full - dropping %s to %s", send_func.__name__, kwargs.get('to_email'))
+            dropped: Future = Future()
+            dropped.set_result(False)
+            return dropped
+
+        try:
+            return self.executor.submit(self._safe_send, send_func, kwargs)
+        except Exception:
+            self.queue_slots.release()
+            raise
+
+    def _safe_send(self, send_func: Callable[..., bool], kwargs: Dict[str, Any]) -> bool:
+        """Run a send function, logging any error instead of losing it in the Future"""
+        try:
+            return send_func(**kwargs)
+        except Exception as e:
+            logger.error("✗ Error in background email send (%s) to %s: %s", send_func.__name__, kwargs.get('to_email'), e, exc_info=True)
+            return False
+        finally:
+            self.queue_slots.release()
+
     def send_email(
         self,
         to_email: str,
@@ -30,7 +162,7 @@ class EmailService:
         text_content: Optional[str] = None
     ) -> bool:
         """
-        Send an email using Mailgun.
+        Send an email using the configured provider.
 
         Args:
             to_email: Recipient email address
@@ -43,58 +175,7 @@ class EmailService:
         Returns:
             bool: True if email sent successfully, False otherwise
         """
-        if not self.api_key:
-            logger.error("Mailgun API key not configured")
-            return False
-
-        if not self.domain:
-            logger.error("Mailgun domain not configured")
-            return False
-
-        logger.info(f"Attempting to send email to {to_email} from {from_email}")
-        logger.debug(f"Subject: {subject}")
-
-        try:
-            # Format the from address with name
-            from_address = f"{from_name} <{from_email}>"
-
-            # Prepare the email data
-            data = {
-                "from": from_address,
-                "to": to_email,
-                "subject": subject,
-                "html": html_content
-            }
-
-            # Add text content if provided
-            if text_content:
-                data["text"] = text_content
-
-            # Send the request to Mailgun
-            response = requests.post(
-                self.api_url,
-                auth=("api", self.api_key),
-                data=data,
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                logger.info(f"✓ Email sent successfully to {to_email} (Status: {response.status_code})")
-                logger.debug(f"Mailgun response: {response.json()}")
-                return True
-            else:
-                logger.error(f"✗ Failed to send email. Status: {response.status_code}, Body: {response.text}")
-                return False
-
-        except requests.exceptions.Timeout:
-            logger.error(f"✗ Timeout sending email to {to_email}", exc_info=True)
-            return False
-        except requests.exceptions.RequestException as e:
-            logger.error(f"✗ Request error sending email to {to_email}: {str(e)}", exc_info=True)
-            return False
-        except Exception as e:
-            logger.error(f"✗ Error sending email to {to_email}: {str(e)}", exc_info=True)
-            return False
+        return self.provider.send(to_email, subject, html_content, from_email, from_name, text_content)
 
     def send_verification_email(
         self,
@@ -122,30 +203,8 @@ class EmailService:
 
         subject = f"Verify your email for {site_name}"
 
-        html_content = f"""
-        <html>
-            <body>
-                <h2>Welcome to {site_name}!</h2>
-                <p>Please verify your email address by clicking the link below:</p>
-                <p><a href="{verification_url}">Verify Email</a></p>
-                <p>Or copy and paste this URL into your browser:</p>
-                <p>{verification_url}</p>
-                <p>This link will expire in 24 hours.</p>
-                <p>If you didn't create an account, you can safely ignore this email.</p>
-            </body>
-        </html>
-        """
-
-        text_content = f"""
-        Welcome to {site_name}!
-
-        Please verify your email address by visiting this URL:
-        {verification_url}
-
-        This link will expire in 24 hours.
-
-        If you didn't create an account, you can safely ignore this email.
-        """
+        html_content = VERIFICATION_HTML.substitute(site_name=html.escape(site_name), url=html.escape(verification_url))
+        text_content = VERIFICATION_TEXT.substitute(site_name=site_name, url=verification_url)
 
         return self.send_email(to_email, subject, html_content, from_email, from_name, text_content)
 
@@ -178,33 +237,8 @@ class EmailService:
 
         subject = f"Reset your password for {site_name}"
 
-        html_content = f"""
-        <html>
-            <body>
-                <h2>Password Reset Request</h2>
-                <p>We received a request to reset your password for {site_name}.</p>
-                <p>Click the link below to reset your password:</p>
-                <p><a href="{reset_url}">Reset Password</a></p>
-                <p>Or copy and paste this URL into your browser:</p>
-                <p>{reset_url}</p>
-                <p>This link will expire in 1 hour.</p>
-                <p>If you didn't request a password reset, you can safely ignore this email.</p>
-            </body>
-        </html>
-        """
-
-        text_content = f"""
-        Password Reset Request
-
-        We received a request to reset your password for {site_name}.
-
-        Visit this URL to reset your password:
-        {reset_url}
-
-        This link will expire in 1 hour.
-
-        If you didn't request a password reset, you can safely ignore this email.
-        """
+        html_content = PASSWORD_RESET_HTML.substitute(site_name=html.escape(site_name), url=html.escape(reset_url))
+        text_content = PASSWORD_RESET_TEXT.substitute(site_name=site_name, url=reset_url)
 
         return self.send_email(to_email, subject, html_content, from_email, from_name, text_content)
 
@@ -237,33 +271,8 @@ class EmailService:
 
         subject = f"Confirm your email change for {site_name}"
 
-        html_content = f"""
-        <html>
-            <body>
-                <h2>Email Change Confirmation</h2>
-                <p>You requested to change your email address for {site_name}.</p>
-                <p>Click the link below to confirm this change:</p>
-                <p><a href="{confirmation_url}">Confirm Email Change</a></p>
-                <p>Or copy and paste this URL into your browser:</p>
-                <p>{confirmation_url}</p>
-                <p>This link will expire in 24 hours.</p>
-                <p>If you didn't request this change, please ignore this email and contact support immediately.</p>
-            </body>
-        </html>
-        """
-
-        text_content = f"""
-        Email Change Confirmation
-
-        You requested to change your email address for {site_name}.
-
-        Visit this URL to confirm this change:
-        {confirmation_url}
-
-        This link will expire in 24 hours.
-
-        If you didn't request this change, please ignore this email and contact support immediately.
-        """
+        html_content = EMAIL_CHANGE_HTML.substitute(site_name=html.escape(site_name), url=html.escape(confirmation_url))
+        text_content = EMAIL_CHANGE_TEXT.substitute(site_name=site_name, url=confirmation_url)
 
         return self.send_email(to_email, subject, html_content, from_email, from_name, text_content)
 
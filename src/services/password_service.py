@@ -1,9 +1,13 @@
 import bcrypt
+from config import get_config
 
 
 class PasswordService:
     """Service for password hashing and verification using bcrypt"""
 
+    def __init__(self):
+        self.rounds = get_config().BCRYPT_ROUNDS
+
     def hash_password(self, password: str) -> str:
         """
         Hash a plain text password using bcrypt.
@@ -15,7 +19,7 @@ class PasswordService:
             str: The bcrypt hashed password as a string
         """
         password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.rounds)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
 
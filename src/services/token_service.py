@@ -1,12 +1,39 @@
-import secrets
+import base64
+import os
+import re
+import threading
 import time
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 from database import db_manager
 from config import get_config
 from models.auth_token import AuthToken
+from models.user import User
 from models.email_verification_token import EmailVerificationToken
 from models.password_reset_token import PasswordResetToken
 from models.email_change_request import EmailChangeRequest
+from utils.ttl_cache import TTLCache
+
+# Number of random bytes in each generated token (43 URL-safe base64 characters)
+TOKEN_BYTES = 32
+
+# Longest token that can be stored (token columns are VARCHAR(255))
+MAX_TOKEN_LENGTH = 255
+
+# Tokens are URL-safe base64; anything else cannot exist in the database
+TOKEN_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,%d}' % MAX_TOKEN_LENGTH)
+
+
+def is_well_formed_token(token: str) -> bool:
+    """
+    Check that a token string could be one of ours before looking it up.
+
+    Args:
+        token: The token string to check
+
+    Returns:
+        bool: True if the token has a valid length and only URL-safe base64 characters
+    """
+    return TOKEN_PATTERN.fullmatch(token) is not None
 
 
 class TokenService:
@@ -14,6 +41,24 @@ class TokenService:
 
     def __init__(self):
         self.config = get_config()
+        # Token lifetimes in seconds, read once instead of on every token creation
+        self.auth_token_expiration = self.config.AUTH_TOKEN_EXPIRATION
+        self.email_verification_expiration = self.config.EMAIL_VERIFICATION_EXPIRATION
+        self.password_reset_expiration = self.config.PASSWORD_RESET_EXPIRATION
+        self.email_change_expiration = self.config.EMAIL_CHANGE_EXPIRATION
+        # token -> (user_id, expires_at) for recently validated auth tokens
+        self.auth_token_cache = TTLCache(
+            maxsize=self.config.AUTH_TOKEN_CACHE_SIZE,
+            ttl=self.config.AUTH_TOKEN_CACHE_TTL
+        )
+        # Bumped on every revocation, so a validation whose database read raced with a
+        # revocation does not put the revoked token back in the cache
+        self.revocations = 0
+        self.revocation_lock = threading.Lock()
+
+    def _now(self) -> int:
+        """Current Unix timestamp in whole seconds (patched in tests to freeze time)"""
+        return int(time.time())
 
     def generate_token(self) -> str:
         """
@@ -22,7 +67,24 @@ class TokenService:
         Returns:
             str: A cryptographically secure random token string
         """
-        return secrets.token_urlsafe(32)
+        # Equivalent to secrets.token_urlsafe(TOKEN_BYTES), without the extra indirection
+        return base64.urlsafe_b64encode(os.urandom(TOKEN_BYTES)).rstrip(b'=').decode('ascii')
+
+    def generate_tokens(self, count: int) -> List[str]:
+        """
+        Generate several secure random tokens from a single urandom call.
+
+        Args:
+            count: Number of tokens to generate
+
+        Returns:
+            List[str]: Token strings in the same format as generate_token()
+        """
+        raw = os.urandom(TOKEN_BYTES * count)
+        return [
+            base64.urlsafe_b64encode(raw[i:i + TOKEN_BYTES]).rstrip(b'=').decode('ascii')
+            for i in range(0, len(raw), TOKEN_BYTES)
+        ]
 
     def create_auth_token(self, site_id: int, user_id: int) -> AuthToken:
         """
@@ -36,8 +98,8 @@ class TokenService:
             AuthToken: The created auth token model
         """
         token_str = self.generate_token()
-        created_at = int(time.time())
-        expires_at = created_at + self.config.AUTH_TOKEN_EXPIRATION
+        created_at = self._now()
+        expires_at = created_at + self.auth_token_expiration
 
         auth_token = AuthToken(
             token=token_str,
@@ -49,6 +111,34 @@ class TokenService:
 
         return db_manager.create_auth_token(auth_token)
 
+    def create_auth_tokens(self, site_user_pairs: List[Tuple[int, int]]) -> List[AuthToken]:
+        """
+        Create authentication tokens for many users in one database round-trip.
+
+        Intended for admin tooling and test setup that need tokens in bulk.
+
+        Args:
+            site_user_pairs: (site_id, user_id) pairs to create a token for
+
+        Returns:
+            List[AuthToken]: The created auth tokens, in the same order as the pairs
+        """
+        created_at = self._now()
+        expires_at = created_at + self.auth_token_expiration
+
+        auth_tokens = [
+            AuthToken(
+                token=token_str,
+                site_id=site_id,
+                user_id=user_id,
+                expires_at=expires_at,
+                created_at=created_at
+            )
+            for (site_id, user_id), token_str in zip(site_user_pairs, self.generate_tokens(len(site_user_pairs)))
+        ]
+
+        return db_manager.create_auth_tokens(auth_tokens)
+
     def validate_auth_token(self, token: str) -> Optional[int]:
         """
         Validate an authentication token and check if it's still valid.
@@ -56,20 +146,102 @@ class TokenService:
         Args:
             token: The auth token string to validate
 
+        Recently validated tokens are served from an in-process cache for up to
+        AUTH_TOKEN_CACHE_TTL seconds without a database lookup.
+
         Returns:
             Optional[int]: The user_id if token is valid, None if invalid or expired
         """
+        if not is_well_formed_token(token):
+            return None
+
+        current_time = self._now()
+
+        cached = self.auth_token_cache.get(token)
+        if cached is not None:
+            return self._unexpired_user_id(token, cached, current_time)
+
+        revocations = self.revocations
         auth_token = db_manager.find_auth_token_by_token(token)
 
         if not auth_token:
             return None
 
-        current_time = int(time.time())
         if auth_token.expires_at < current_time:
             return None
 
+        self.cache_auth_token(token, auth_token.user_id, auth_token.expires_at, revocations)
+
         return auth_token.user_id
 
+    def validate_auth_token_with_user(self, token: str) -> Tuple[Optional[int], Optional[User]]:
+        """
+        Validate an authentication token, loading its user in the same query on a cache miss.
+
+        Applies the same checks as validate_auth_token(). Tokens found in the validation
+        cache cost no query, but then only the user_id is known and the caller loads the user.
+
+        Args:
+            token: The auth token string to validate
+
+        Returns:
+            Tuple[Optional[int], Optional[User]]: (user_id, user). user_id is None if the token
+            is invalid or expired. user is None on a cache hit or an invalid token.
+        """
+        if not is_well_formed_token(token):
+            return None, None
+
+        current_time = self._now()
+
+        cached = self.auth_token_cache.get(token)
+        if cached is not None:
+            return self._unexpired_user_id(token, cached, current_time), None
+
+        revocations = self.revocations
+        # Token and user in one round-trip instead of two
+        found = db_manager.find_user_by_auth_token(token)
+        if not found:
+            return None, None
+
+        user, expires_at = found
+        if expires_at < current_time:
+            return None, None
+
+        self.cache_auth_token(token, user.id, expires_at, revocations)
+
+        return user.id, user
+
+    def cache_auth_token(self, token: str, user_id: int, expires_at: int, revocations: int) -> None:
+        """
+        Remember a token that was just validated against the database.
+
+        Skipped if any token was revoked since the lookup started, as the row that
+        was read may already be deleted.
+
+        Args:
+            token: The auth token string
+            user_id: The user the token belongs to
+            expires_at: The token's expiration timestamp
+            revocations: The revocation count read before the database lookup
+        """
+        with self.revocation_lock:
+            if self.revocations == revocations:
+                self.auth_token_cache.set(token, (user_id, expires_at))
+
+    def _evict_revoked(self, evict: Callable[[], None]) -> None:
+        """Drop revoked tokens from the cache, and stop in-flight validations from re-caching them"""
+        with self.revocation_lock:
+            self.revocations += 1
+            evict()
+
+    def _unexpired_user_id(self, token: str, cached: Tuple[int, int], current_time: int) -> Optional[int]:
+        """Return the user_id of a cached token, dropping it if it has expired"""
+        user_id, expires_at = cached
+        if expires_at < current_time:
+            self.auth_token_cache.pop(token)
+            return None
+        return user_id
+
     def invalidate_auth_token(self, token: str) -> bool:
         """
         Invalidate (delete) a specific authentication token.
@@ -80,7 +252,10 @@ class TokenService:
         Returns:
             bool: True if token was found and deleted, False otherwise
         """
-        return db_manager.delete_auth_token(token)
+        # Delete first: evicting first would let a concurrent validation re-cache the row
+        deleted = db_manager.delete_auth_token(token)
+        self._evict_revoked(lambda: self.auth_token_cache.pop(token))
+        return deleted
 
     def invalidate_user_tokens(self, user_id: int) -> None:
         """
@@ -90,6 +265,7 @@ class TokenService:
             user_id: The ID of the user whose tokens should be invalidated
         """
         db_manager.delete_auth_tokens_by_user(user_id)
+        self._evict_revoked(lambda: self.auth_token_cache.discard_where(lambda cached: cached[0] == user_id))
 
     def create_email_verification_token(self, site_id: int, user_id: int) -> EmailVerificationToken:
         """
@@ -103,8 +279,8 @@ class TokenService:
             EmailVerificationToken: The created verification token model
         """
         token_str = self.generate_token()
-        created_at = int(time.time())
-        expires_at = created_at + self.config.EMAIL_VERIFICATION_EXPIRATION
+        created_at = self._now()
+        expires_at = created_at + self.email_verification_expiration
 
         email_token = EmailVerificationToken(
             token=token_str,
@@ -129,12 +305,15 @@ class TokenService:
         Returns:
             Optional[int]: The user_id if token is valid, None if invalid or expired
         """
+        if not is_well_formed_token(token):
+            return None
+
         email_token = db_manager.find_email_verification_token(token)
 
         if not email_token:
             return None
 
-        current_time = int(time.time())
+        current_time = self._now()
         if email_token.expires_at < current_time:
             return None
 
@@ -150,17 +329,14 @@ class TokenService:
         Returns:
             Optional[int]: The user_id if token is valid, None if invalid or expired
         """
-        email_token = db_manager.find_email_verification_token(token)
-
-        if not email_token:
+        if not is_well_formed_token(token):
             return None
 
-        current_time = int(time.time())
-        if email_token.expires_at < current_time:
-            return None
+        # Find and delete in one statement (one-time use, safe against concurrent use)
+        email_token = db_manager.consume_email_verification_token(token, self._now())
 
-        # Delete token after successful validation (one-time use)
-        db_manager.delete_email_verification_token(token)
+        if not email_token:
+            return None
 
         return email_token.user_id
 
@@ -176,8 +352,8 @@ class TokenService:
             PasswordResetToken: The created password reset token model
         """
         token_str = self.generate_token()
-        created_at = int(time.time())
-        expires_at = created_at + self.config.PASSWORD_RESET_EXPIRATION
+        created_at = self._now()
+        expires_at = created_at + self.password_reset_expiration
 
         reset_token = PasswordResetToken(
             token=token_str,
@@ -200,17 +376,14 @@ class TokenService:
         Returns:
             Optional[int]: The user_id if token is valid, None if invalid, expired, or already used
         """
-        reset_token = db_manager.find_password_reset_token(token)
-
-        if not reset_token:
+        if not is_well_formed_token(token):
             return None
 
-        current_time = int(time.time())
-        if reset_token.used or reset_token.expires_at < current_time:
-            return None
+        # Check and mark as used in one statement (safe against concurrent use)
+        reset_token = db_manager.consume_password_reset_token(token, self._now())
 
-        # Mark token as used
-        db_manager.mark_password_reset_token_used(token)
+        if not reset_token:
+            return None
 
         return reset_token.user_id
 
@@ -227,8 +400,8 @@ class TokenService:
             EmailChangeRequest: The created email change request model
         """
         token_str = self.generate_token()
-        created_at = int(time.time())
-        expires_at = created_at + self.config.EMAIL_CHANGE_EXPIRATION
+        created_at = self._now()
+        expires_at = created_at + self.email_change_expiration
 
         change_request = EmailChangeRequest(
             token=token_str,
@@ -251,32 +424,22 @@ class TokenService:
         Returns:
             Optional[EmailChangeRequest]: The email change request if valid, None if invalid or expired
         """
-        change_request = db_manager.find_email_change_request(token)
-
-        if not change_request:
-            return None
-
-        current_time = int(time.time())
-        if change_request.expires_at < current_time:
+        if not is_well_formed_token(token):
             return None
 
-        # Delete token after successful validation (one-time use)
-        db_manager.delete_email_change_request(token)
+        # Find and delete in one statement (one-time use, safe against concurrent use)
+        return db_manager.consume_email_change_request(token, self._now())
 
-        return change_request
-
-    def cleanup_expired_tokens(self) -> None:
+    def cleanup_expired_tokens(self) -> int:
         """
         Remove all expired tokens from the database.
 
         Should be run periodically to clean up expired tokens.
-        """
-        current_time = int(time.time())
 
-        db_manager.delete_expired_auth_tokens(current_time)
-        db_manager.delete_expired_email_verification_tokens(current_time)
-        db_manager.delete_expired_password_reset_tokens(current_time)
-        db_manager.delete_expired_email_change_requests(current_time)
+        Returns:
+            int: Total number of expired tokens removed
+        """
+        return db_manager.delete_all_expired_tokens(self._now())
 
 
 # Global token service instance
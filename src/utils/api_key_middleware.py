@@ -1,10 +1,15 @@
 """
 API key authorization middleware for protecting administrative endpoints.
 """
+import hmac
 from functools import wraps
-from flask import request, jsonify
+from flask import request
+from utils.responses import error_response
 from config import get_config
 
+# Read once at import time - configuration is loaded from the environment at startup
+MASTER_API_KEY: bytes = get_config().MASTER_API_KEY.encode('utf-8')
+
 
 def require_master_api_key(func):
     """
@@ -17,18 +22,17 @@ def require_master_api_key(func):
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        config = get_config()
-
-        if not config.MASTER_API_KEY:
-            return jsonify({'error': 'Master API key not configured'}), 500
+        if not MASTER_API_KEY:
+            return error_response('Master API key not configured', 500)
 
         api_key = request.headers.get('X-API-Key')
 
         if not api_key:
-            return jsonify({'error': 'Missing X-API-Key header'}), 401
+            return error_response('Missing X-API-Key header', 401)
 
-        if api_key != config.MASTER_API_KEY:
-            return jsonify({'error': 'Invalid API key'}), 401
+        # Constant-time comparison to avoid leaking the key through response timing
+        if not hmac.compare_digest(api_key.encode('utf-8'), MASTER_API_KEY):
+            return error_response('Invalid API key', 401)
 
         return func(*args, **kwargs)
 
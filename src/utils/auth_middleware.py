@@ -1,9 +1,35 @@
 """
 Authentication middleware for protecting routes.
 """
+import re
 from functools import wraps
-from flask import request, jsonify
-from services.token_service import token_service
+from typing import Optional
+from flask import g, request
+from utils.responses import error_response
+from services.token_service import token_service, MAX_TOKEN_LENGTH, TOKEN_PATTERN
+
+BEARER_PREFIX = 'Bearer '
+# Longer headers cannot hold a valid token and are rejected without further parsing
+MAX_AUTH_HEADER_LENGTH = len(BEARER_PREFIX) + MAX_TOKEN_LENGTH
+# Prefix, token charset and token length checked in a single match
+BEARER_PATTERN = re.compile(re.escape(BEARER_PREFIX) + '(' + TOKEN_PATTERN.pattern + ')')
+
+
+def extract_bearer_token(auth_header: str) -> Optional[str]:
+    """
+    Extract the token from a "Bearer <token>" Authorization header.
+
+    Args:
+        auth_header: The Authorization header value
+
+    Returns:
+        Optional[str]: The token, or None if the header is not a well-formed bearer token
+    """
+    if len(auth_header) > MAX_AUTH_HEADER_LENGTH:
+        return None
+
+    match = BEARER_PATTERN.fullmatch(auth_header)
+    return match.group(1) if match else None
 
 
 def require_auth(func):
@@ -11,7 +37,7 @@ def require_auth(func):
     Decorator to require authentication for a route.
     Extracts the auth token from the Authorization header and validates it.
 
-    Sets request.user_id with the authenticated user's ID.
+    Sets g.user_id with the authenticated user's ID and g.auth_token with the token.
 
     Returns 401 if token is missing or invalid.
     """
@@ -20,19 +46,20 @@ def require_auth(func):
         auth_header = request.headers.get('Authorization')
 
         if not auth_header:
-            return jsonify({'error': 'Missing authorization header'}), 401
+            return error_response('Missing authorization header', 401)
 
-        if not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Invalid authorization header format'}), 401
+        token = extract_bearer_token(auth_header)
 
-        token = auth_header[7:]  # Remove 'Bearer ' prefix
+        if token is None:
+            return error_response('Invalid authorization header format', 401)
 
         user_id = token_service.validate_auth_token(token)
 
         if user_id is None:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+            return error_response('Invalid or expired token', 401)
 
-        request.user_id = user_id
+        g.user_id = user_id
+        g.auth_token = token
         return func(*args, **kwargs)
 
     return wrapper
@@ -0,0 +1,47 @@
+"""
+orjson-backed JSON provider for Flask.
+"""
+import decimal
+from typing import Any, Union
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+# Match Flask's default provider: sorted keys, and allow non-string dict keys
+DUMPS_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the types Flask supports that orjson does not handle natively"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider that encodes and decodes with orjson.
+
+    Used for jsonify, dict/list return values and request.get_json().
+    """
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string (extra json.dumps keyword arguments are ignored)"""
+        return orjson.dumps(obj, default=_default, option=DUMPS_OPTIONS).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize the arguments straight to a JSON response body, without a str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        option = DUMPS_OPTIONS | orjson.OPT_APPEND_NEWLINE
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=_default, option=option), mimetype=self.mimetype)
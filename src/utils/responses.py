@@ -0,0 +1,29 @@
+"""
+JSON error responses for the fixed error messages returned by the middleware.
+"""
+import json
+from functools import lru_cache
+from flask import Response
+
+
+@lru_cache(maxsize=64)
+def _error_body(message: str) -> bytes:
+    """Serialize an error message once; the middleware only uses a handful of fixed messages"""
+    return json.dumps({'error': message}, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def error_response(message: str, status: int) -> Response:
+    """
+    Build a JSON error response of the form {"error": message}.
+
+    Only the body is cached. A new Response is created per call because
+    after_request handlers (e.g. CORS) add headers to it.
+
+    Args:
+        message: The error message
+        status: The HTTP status code
+
+    Returns:
+        Response: The JSON error response
+    """
+    return Response(_error_body(message), status=status, mimetype='application/json')
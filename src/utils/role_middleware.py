@@ -2,9 +2,10 @@
 Role-based authorization middleware for protecting endpoints by user role.
 """
 from functools import wraps
-from flask import request, jsonify
-from services.token_service import token_service
-from database import db_manager
+from flask import g, request
+from utils.responses import error_response
+from utils.auth_middleware import extract_bearer_token
+from services.auth_service import auth_service
 from models.user_role import UserRole
 
 
@@ -20,35 +21,37 @@ def require_role(required_role: UserRole):
 
     Returns:
         Decorator function that validates user role
+
+    Raises:
+        ValueError: If required_role is not a valid role (raised when the route is decorated)
     """
+    # Resolved once when the route is decorated; a bad role fails at import, not per request
+    required_role = UserRole(required_role)
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             auth_header = request.headers.get('Authorization')
 
             if not auth_header:
-                return jsonify({'error': 'Missing authorization header'}), 401
-
-            if not auth_header.startswith('Bearer '):
-                return jsonify({'error': 'Invalid authorization header format'}), 401
-
-            token = auth_header[7:]  # Remove 'Bearer ' prefix
+                return error_response('Missing authorization header', 401)
 
-            user_id = token_service.validate_auth_token(token)
+            token = extract_bearer_token(auth_header)
 
-            if user_id is None:
-                return jsonify({'error': 'Invalid or expired token'}), 401
+            if token is None:
+                return error_response('Invalid authorization header format', 401)
 
-            user = db_manager.find_user_by_id(user_id)
+            user = auth_service.get_user_by_token(token)
 
             if not user:
-                return jsonify({'error': 'User not found'}), 401
+                return error_response('Invalid or expired token', 401)
 
-            if user.role != required_role:
-                return jsonify({'error': 'Insufficient permissions'}), 403
+            # Enum members are singletons (User.from_dict always yields one), so identity is enough
+            if user.role is not required_role:
+                return error_response('Insufficient permissions', 403)
 
-            request.user_id = user_id
-            request.user = user
+            g.user_id = user.id
+            g.user = user
 
             return func(*args, **kwargs)
 
@@ -16,14 +16,21 @@ def validate_request(schema_class):
     Returns:
         Decorator function that validates request and passes validated data to the route
     """
+    # Schemas hold no per-request state, so one instance is built when the route is
+    # decorated and shared by every request instead of being rebuilt per call
+    schema = schema_class()
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            schema = schema_class()
+            # An explicitly empty body needs no parsing. get_json caches its result on the
+            # request, so handlers calling it again do not parse the body twice.
+            # silent=True: a missing or malformed body is reported as a validation error
+            data = {} if request.content_length == 0 else request.get_json(silent=True)
             try:
-                validated_data = schema.load(request.get_json() or {})
-                return func(validated_data, *args, **kwargs)
+                validated_data = schema.load(data or {})
             except ValidationError as err:
                 return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+            return func(validated_data, *args, **kwargs)
         return wrapper
     return decorator
@@ -1,18 +1,41 @@
+import dataclasses
 import pytest
 import time
 import os
 import sys
+from contextlib import contextmanager
+from functools import lru_cache
+import psycopg2
+import psycopg2.extensions
 
 # Add src to path so we can import our modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+# Minimum bcrypt cost for tests, and no real emails even if .env holds provider keys
+# (config is read at import time, and load_dotenv() does not override these, so set them before importing)
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+os.environ.setdefault('EMAIL_PROVIDER', 'none')
+
 from database import db_manager
 from models.site import Site
 from models.user import User
 from models.user_role import UserRole
 from models.auth_token import AuthToken
+from services.token_service import token_service
+from services.auth_service import auth_service
+from services.password_service import password_service
 from app import create_app
 
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), '..', 'database', 'schema.sql')
+
+# Fixed "now" for tests that assert on exact token timestamps (see frozen_time)
+FROZEN_TIME = 1_700_000_000
+
+TRUNCATE_SQL = (
+    "TRUNCATE sites, users, auth_tokens, email_verification_tokens, password_reset_tokens, email_change_requests "
+    "RESTART IDENTITY CASCADE"
+)
+
 
 @pytest.fixture(scope='session', autouse=True)
 def setup_test_environment():
@@ -21,19 +44,130 @@ def setup_test_environment():
     yield
 
 
-@pytest.fixture(scope='function')
-def clean_database():
-    """Clean all tables before each test"""
-    with db_manager.get_cursor(commit=True) as cursor:
-        cursor.execute("TRUNCATE sites, users, auth_tokens, email_verification_tokens, password_reset_tokens, email_change_requests CASCADE")
-    yield
-    with db_manager.get_cursor(commit=True) as cursor:
-        cursor.execute("TRUNCATE sites, users, auth_tokens, email_verification_tokens, password_reset_tokens, email_change_requests CASCADE")
+class RollbackConnection(psycopg2.extensions.connection):
+    """
+    Connection shared by the whole test session that never commits.
 
+    The session runs in a single transaction. Each test starts at a savepoint
+    and is rolled back to it afterwards. commit() and rollback() from the code
+    under test act on an inner savepoint, and autocommit changes are ignored.
+    Rows written between begin_session() and the first test (the session
+    fixtures) survive every per-test rollback.
+    """
 
-@pytest.fixture
-def sample_site(clean_database):
-    """Create a sample site for testing"""
+    TEST_SAVEPOINT = 'test_start'
+    SAVEPOINT = 'test_savepoint'
+
+    autocommit = property(lambda self: False, lambda self, value: None)
+
+    def begin_session(self) -> None:
+        with self.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {self.SAVEPOINT}")
+
+    def begin_test(self) -> None:
+        with self.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {self.TEST_SAVEPOINT}; SAVEPOINT {self.SAVEPOINT}")
+
+    def commit(self) -> None:
+        with self.cursor() as cursor:
+            cursor.execute(f"RELEASE SAVEPOINT {self.SAVEPOINT}; SAVEPOINT {self.SAVEPOINT}")
+
+    def rollback(self) -> None:
+        with self.cursor() as cursor:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {self.SAVEPOINT}")
+
+    def end_test(self) -> None:
+        with self.cursor() as cursor:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {self.TEST_SAVEPOINT}")
+
+    def end_session(self) -> None:
+        psycopg2.extensions.connection.rollback(self)
+        self.close()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cached_password_hashing():
+    """Hash and verify each distinct password once per session instead of once per call"""
+    # bcrypt is deliberately slow, and the tests reuse a handful of passwords
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(password_service, 'hash_password', lru_cache(maxsize=None)(password_service.hash_password))
+        mp.setattr(password_service, 'verify_password', lru_cache(maxsize=None)(password_service.verify_password))
+        yield
+
+
+def _connect(**kwargs) -> psycopg2.extensions.connection:
+    """Open a new connection to the test database"""
+    config = db_manager.config
+    return psycopg2.connect(
+        host=config.DB_HOST,
+        port=config.DB_PORT,
+        database=config.DB_NAME,
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        **kwargs
+    )
+
+
+@contextmanager
+def _worker_schema(worker: str):
+    """Create a private copy of the schema for one pytest-xdist worker, dropped afterwards"""
+    schema = f"test_{worker}"
+    with open(SCHEMA_FILE) as f:
+        schema_sql = f.read()
+
+    admin_conn = _connect()
+    admin_conn.autocommit = True
+    try:
+        with admin_conn.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema}")
+            cursor.execute(f"SET search_path TO {schema}")
+            cursor.execute(schema_sql)
+        yield schema
+        with admin_conn.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    finally:
+        admin_conn.close()
+
+
+@pytest.fixture(scope='session')
+def test_connection():
+    """Open one never-committing connection for the whole session, starting from empty tables"""
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+
+    if worker is None:
+        # Remove rows left behind by earlier runs
+        with db_manager.get_cursor(commit=True) as cursor:
+            cursor.execute(TRUNCATE_SQL)
+        conn = _connect(connection_factory=RollbackConnection)
+        conn.begin_session()
+        yield conn
+        conn.end_session()
+        return
+
+    # Under pytest-xdist each worker gets its own schema, so workers never wait on
+    # each other's uncommitted rows (e.g. the same sample site domain)
+    with _worker_schema(worker) as schema:
+        conn = _connect(connection_factory=RollbackConnection, options=f"-c search_path={schema}")
+        conn.begin_session()
+        yield conn
+        conn.end_session()
+
+
+@contextmanager
+def _use_connection(conn):
+    """Route every db_manager query to the given connection"""
+    @contextmanager
+    def get_test_connection():
+        yield conn
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(db_manager, 'get_connection', get_test_connection)
+        yield
+
+
+@pytest.fixture(scope='session')
+def session_site(test_connection):
+    """Insert the sample site once for the whole session, below every test's savepoint"""
     current_time = int(time.time())
     site = Site(
         id=0,
@@ -45,7 +179,39 @@ def sample_site(clean_database):
         created_at=current_time,
         updated_at=current_time
     )
-    return db_manager.create_site(site)
+    with _use_connection(test_connection):
+        return db_manager.create_site(site)
+
+
+@pytest.fixture(scope='function')
+def isolated_database(test_connection, session_site):
+    """
+    Run the test in isolation, rolling back everything it wrote afterwards.
+
+    The database is not empty: rows inserted by session fixtures (the sample site
+    from session_site) are visible to every test and survive the rollback.
+    """
+    # Rows vanish on rollback without going through the services, so drop any cached token validations and users too
+    token_service.auth_token_cache.clear()
+    auth_service.user_cache.clear()
+
+    test_connection.begin_test()
+    with _use_connection(test_connection):
+        yield
+    test_connection.end_test()
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Freeze the token service clock at FROZEN_TIME and return it"""
+    monkeypatch.setattr(token_service, '_now', lambda: FROZEN_TIME)
+    return FROZEN_TIME
+
+
+@pytest.fixture
+def sample_site(isolated_database, session_site):
+    """The shared sample site (a copy, so tests can modify it; database changes are rolled back)"""
+    return dataclasses.replace(session_site)
 
 
 @pytest.fixture
@@ -65,6 +231,26 @@ def sample_user(sample_site):
     return db_manager.create_user(user)
 
 
+@pytest.fixture
+def make_verified_user(sample_site):
+    """Return a factory that inserts an already verified user with a real password hash"""
+    def make(email: str, password: str) -> User:
+        current_time = int(time.time())
+        user = User(
+            id=0,
+            site_id=sample_site.id,
+            email=email,
+            password_hash=password_service.hash_password(password),
+            is_verified=True,
+            role=UserRole.USER,
+            created_at=current_time,
+            updated_at=current_time
+        )
+        return db_manager.create_user(user)
+
+    return make
+
+
 @pytest.fixture
 def admin_user(sample_site):
     """Create an admin user for testing"""
@@ -110,10 +296,16 @@ def user_auth_token(sample_site, sample_user):
     return db_manager.create_auth_token(token)
 
 
-@pytest.fixture
-def test_client():
-    """Create a Flask test client"""
+@pytest.fixture(scope='session')
+def app():
+    """Create the Flask app once for the whole test session"""
     app = create_app()
     app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def test_client(app):
+    """Create a Flask test client"""
     with app.test_client() as client:
         yield client
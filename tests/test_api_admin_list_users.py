@@ -3,6 +3,7 @@ Tests for the admin list users endpoint.
 """
 import time
 from database import db_manager
+from models.auth_token import AuthToken
 from models.site import Site
 from models.user import User
 from models.user_role import UserRole
@@ -42,7 +43,7 @@ def test_admin_list_users_non_admin_forbidden(test_client, user_auth_token):
     assert 'insufficient permissions' in data['error'].lower()
 
 
-def test_admin_list_users_missing_auth_header(test_client, clean_database):
+def test_admin_list_users_missing_auth_header(test_client, isolated_database):
     """Test that missing auth header returns 401"""
     response = test_client.get('/api/admin/users')
 
@@ -52,7 +53,7 @@ def test_admin_list_users_missing_auth_header(test_client, clean_database):
     assert 'missing' in data['error'].lower()
 
 
-def test_admin_list_users_invalid_token(test_client, clean_database):
+def test_admin_list_users_invalid_token(test_client, isolated_database):
     """Test that an invalid token returns 401"""
     response = test_client.get(
         '/api/admin/users',
@@ -77,6 +78,30 @@ def test_admin_list_users_invalid_auth_format(test_client, admin_auth_token):
     assert 'invalid' in data['error'].lower()
 
 
+def test_admin_list_users_oversized_auth_header(test_client, isolated_database):
+    """Test that an oversized auth header is rejected as invalid format"""
+    response = test_client.get(
+        '/api/admin/users',
+        headers={'Authorization': 'Bearer ' + 'a' * 1000}
+    )
+
+    assert response.status_code == 401
+    data = response.get_json()
+    assert 'invalid' in data['error'].lower()
+
+
+def test_admin_list_users_malformed_token(test_client, isolated_database):
+    """Test that a token with characters outside the token alphabet is rejected as invalid format"""
+    response = test_client.get(
+        '/api/admin/users',
+        headers={'Authorization': "Bearer abc' OR '1'='1"}
+    )
+
+    assert response.status_code == 401
+    data = response.get_json()
+    assert 'invalid' in data['error'].lower()
+
+
 def test_admin_list_users_site_isolation(test_client, sample_site, admin_user, admin_auth_token):
     """Test that admin only sees users from their own site, not other sites"""
     # Create another site with users
@@ -93,18 +118,21 @@ def test_admin_list_users_site_isolation(test_client, sample_site, admin_user, a
     )
     other_site = db_manager.create_site(other_site)
 
-    # Create a user on the other site
-    other_user = User(
-        id=0,
-        site_id=other_site.id,
-        email="other@example.com",
-        password_hash="$2b$12$hashed_password",
-        is_verified=True,
-        role=UserRole.USER,
-        created_at=current_time,
-        updated_at=current_time
-    )
-    db_manager.create_user(other_user)
+    # Create users on the other site
+    other_users = db_manager.create_users([
+        User(
+            id=0,
+            site_id=other_site.id,
+            email=email,
+            password_hash="$2b$12$hashed_password",
+            is_verified=True,
+            role=UserRole.USER,
+            created_at=current_time,
+            updated_at=current_time
+        )
+        for email in ("other@example.com", "other2@example.com")
+    ])
+    assert all(user.id for user in other_users)
 
     # Admin from sample_site should only see users from sample_site
     response = test_client.get(
@@ -119,6 +147,7 @@ def test_admin_list_users_site_isolation(test_client, sample_site, admin_user, a
     emails = [user['email'] for user in data]
     assert 'admin@example.com' in emails
     assert 'other@example.com' not in emails
+    assert 'other2@example.com' not in emails
 
 
 def test_admin_list_users_returns_user_fields(test_client, admin_auth_token, admin_user):
@@ -140,8 +169,6 @@ def test_admin_list_users_returns_user_fields(test_client, admin_auth_token, adm
 
 def test_admin_list_users_expired_token(test_client, sample_site, admin_user):
     """Test that an expired token returns 401"""
-    from models.auth_token import AuthToken
-
     current_time = int(time.time())
     expired_token = AuthToken(
         token="expired_admin_token",
@@ -0,0 +1,44 @@
+"""
+Tests for the master API key middleware.
+"""
+import pytest
+import utils.api_key_middleware as api_key_middleware
+
+
+@pytest.fixture
+def master_api_key(monkeypatch):
+    """Configure a known master API key"""
+    monkeypatch.setattr(api_key_middleware, 'MASTER_API_KEY', b'test_master_key')
+    return 'test_master_key'
+
+
+def test_master_api_key_valid(test_client, master_api_key, isolated_database):
+    """Test that a valid master API key is accepted"""
+    response = test_client.get('/api/sites', headers={'X-API-Key': master_api_key})
+
+    assert response.status_code == 200
+
+
+def test_master_api_key_invalid(test_client, master_api_key):
+    """Test that an invalid master API key returns 401"""
+    response = test_client.get('/api/sites', headers={'X-API-Key': 'wrong_key'})
+
+    assert response.status_code == 401
+    assert 'invalid api key' in response.get_json()['error'].lower()
+
+
+def test_master_api_key_missing(test_client, master_api_key):
+    """Test that a missing master API key returns 401"""
+    response = test_client.get('/api/sites')
+
+    assert response.status_code == 401
+    assert 'missing' in response.get_json()['error'].lower()
+
+
+def test_master_api_key_not_configured(test_client, monkeypatch):
+    """Test that an unconfigured master API key returns 500"""
+    monkeypatch.setattr(api_key_middleware, 'MASTER_API_KEY', b'')
+
+    response = test_client.get('/api/sites', headers={'X-API-Key': 'any_key'})
+
+    assert response.status_code == 500
@@ -1,21 +1,26 @@
 import time
+import psycopg2
+import pytest
 from database import db_manager
 from models.site import Site
 from models.user import User
 from models.user_role import UserRole
 from models.auth_token import AuthToken
+from models.email_verification_token import EmailVerificationToken
+from models.password_reset_token import PasswordResetToken
+from models.email_change_request import EmailChangeRequest
 
 
-def test_create_site(clean_database):
+def test_create_site(isolated_database):
     """Test creating a site in the database"""
     current_time = int(time.time())
     site = Site(
         id=0,
-        name="Test Site",
-        domain="test.example.com",
-        frontend_url="http://test.example.com",
-        email_from="noreply@test.example.com",
-        email_from_name="Test Site",
+        name="New Site",
+        domain="new.example.com",
+        frontend_url="http://new.example.com",
+        email_from="noreply@new.example.com",
+        email_from_name="New Site",
         created_at=current_time,
         updated_at=current_time
     )
@@ -23,11 +28,11 @@ def test_create_site(clean_database):
     created_site = db_manager.create_site(site)
 
     assert created_site.id > 0
-    assert created_site.name == "Test Site"
-    assert created_site.domain == "test.example.com"
-    assert created_site.frontend_url == "http://test.example.com"
-    assert created_site.email_from == "noreply@test.example.com"
-    assert created_site.email_from_name == "Test Site"
+    assert created_site.name == "New Site"
+    assert created_site.domain == "new.example.com"
+    assert created_site.frontend_url == "http://new.example.com"
+    assert created_site.email_from == "noreply@new.example.com"
+    assert created_site.email_from_name == "New Site"
 
 
 def test_find_site_by_id(sample_site):
@@ -49,7 +54,7 @@ def test_find_site_by_domain(sample_site):
     assert found_site.domain == sample_site.domain
 
 
-def test_find_site_by_id_not_found(clean_database):
+def test_find_site_by_id_not_found(isolated_database):
     """Test finding a site that doesn't exist"""
     found_site = db_manager.find_site_by_id(9999)
 
@@ -92,6 +97,51 @@ def test_create_user(sample_site):
     assert created_user.role == UserRole.USER
 
 
+def _new_user(site_id: int, email: str, role: UserRole = UserRole.USER) -> User:
+    """Build an unsaved user model"""
+    current_time = int(time.time())
+    return User(
+        id=0,
+        site_id=site_id,
+        email=email,
+        password_hash="hashed_password",
+        is_verified=False,
+        role=role,
+        created_at=current_time,
+        updated_at=current_time
+    )
+
+
+def test_create_users(sample_site):
+    """Test bulk-creating users keeps the input order and assigns each its own id"""
+    emails = ["bulk3@example.com", "bulk1@example.com", "bulk2@example.com"]
+    users = [_new_user(sample_site.id, email) for email in emails]
+    users[1].role = UserRole.ADMIN
+
+    created_users = db_manager.create_users(users)
+
+    assert [u.email for u in created_users] == emails
+    assert len({u.id for u in created_users}) == 3
+    for created_user in created_users:
+        found_user = db_manager.find_user_by_id(created_user.id)
+        assert found_user.email == created_user.email
+        assert found_user.role == created_user.role
+    assert db_manager.create_users([]) == []
+
+
+def test_create_users_duplicate_email(sample_site, sample_user):
+    """Test that a duplicate email fails the whole bulk insert"""
+    users = [
+        _new_user(sample_site.id, "fresh@example.com"),
+        _new_user(sample_site.id, sample_user.email)
+    ]
+
+    with pytest.raises(psycopg2.IntegrityError):
+        db_manager.create_users(users)
+
+    assert db_manager.find_user_by_email(sample_site.id, "fresh@example.com") is None
+
+
 def test_find_user_by_id(sample_user):
     """Test finding a user by ID"""
     found_user = db_manager.find_user_by_id(sample_user.id)
@@ -119,6 +169,18 @@ def test_find_user_by_email_different_site(sample_site, sample_user):
     assert found_user is None
 
 
+def test_list_user_summaries_by_site(sample_site, sample_user):
+    """Test listing users as response dicts without sensitive fields"""
+    summaries = db_manager.list_user_summaries_by_site(sample_site.id)
+
+    assert len(summaries) == 1
+    summary = summaries[0]
+    assert summary['id'] == sample_user.id
+    assert summary['email'] == sample_user.email
+    assert summary['role'] == sample_user.role.value
+    assert 'password_hash' not in summary
+
+
 def test_update_user(sample_user):
     """Test updating a user"""
     sample_user.email = "updated@example.com"
@@ -173,6 +235,26 @@ def test_find_auth_token_by_token(sample_site, sample_user):
     assert found_token.user_id == sample_user.id
 
 
+def test_find_user_by_auth_token(sample_site, sample_user):
+    """Test finding a token's user and expiry in one lookup"""
+    current_time = int(time.time())
+    auth_token = AuthToken(
+        token="join_me_token",
+        site_id=sample_site.id,
+        user_id=sample_user.id,
+        expires_at=current_time + 3600,
+        created_at=current_time
+    )
+    db_manager.create_auth_token(auth_token)
+
+    user, expires_at = db_manager.find_user_by_auth_token("join_me_token")
+
+    assert user.id == sample_user.id
+    assert user.email == sample_user.email
+    assert expires_at == current_time + 3600
+    assert db_manager.find_user_by_auth_token("missing_token") is None
+
+
 def test_delete_auth_token(sample_site, sample_user):
     """Test deleting an auth token"""
     current_time = int(time.time())
@@ -198,16 +280,17 @@ def test_delete_auth_tokens_by_user(sample_site, sample_user):
     """Test deleting all auth tokens for a user"""
     current_time = int(time.time())
 
-    # Create multiple tokens
-    for i in range(3):
-        token = AuthToken(
+    # Create multiple tokens in one batch
+    db_manager.create_auth_tokens([
+        AuthToken(
             token=f"token_{i}",
             site_id=sample_site.id,
             user_id=sample_user.id,
             expires_at=current_time + 3600,
             created_at=current_time
         )
-        db_manager.create_auth_token(token)
+        for i in range(3)
+    ])
 
     deleted_count = db_manager.delete_auth_tokens_by_user(sample_user.id)
 
@@ -249,7 +332,103 @@ def test_delete_user(sample_site, sample_user):
     assert found_token is None
 
 
-def test_delete_user_not_found(clean_database):
+def test_delete_user_not_found(isolated_database):
     """Test deleting a non-existent user returns False."""
     deleted = db_manager.delete_user(99999)
     assert deleted is False
+
+
+def test_delete_all_expired_tokens(sample_site, sample_user):
+    """Test that expired tokens of every type are deleted and valid ones are kept"""
+    current_time = int(time.time())
+    db_manager.create_auth_token(AuthToken(
+        token="expired_auth_token",
+        site_id=sample_site.id,
+        user_id=sample_user.id,
+        expires_at=current_time - 60,
+        created_at=current_time - 3600
+    ))
+    db_manager.create_auth_token(AuthToken(
+        token="valid_auth_token",
+        site_id=sample_site.id,
+        user_id=sample_user.id,
+        expires_at=current_time + 3600,
+        created_at=current_time
+    ))
+    db_manager.create_password_reset_token(PasswordResetToken(
+        token="expired_reset_token",
+        site_id=sample_site.id,
+        user_id=sample_user.id,
+        expires_at=current_time - 60,
+        created_at=current_time - 3600,
+        used=False
+    ))
+
+    deleted_count = db_manager.delete_all_expired_tokens(current_time)
+
+    assert deleted_count == 2
+    assert db_manager.find_auth_token_by_token("expired_auth_token") is None
+    assert db_manager.find_password_reset_token("expired_reset_token") is None
+    assert db_manager.find_auth_token_by_token("valid_auth_token") is not None
+
+
+def test_consume_email_verification_token(sample_site, sample_user):
+    """Test that a verification token can only be consumed once"""
+    current_time = int(time.time())
+    db_manager.create_email_verification_token(EmailVerificationToken(
+        token="consume_me_token",
+        site_id=sample_site.id,
+        user_id=sample_user.id,
+        expires_at=current_time + 3600,
+        created_at=current_time
+    ))
+
+    consumed = db_manager.consume_email_verification_token("consume_me_token", current_time)
+
+    assert consumed is not None
+    assert consumed.user_id == sample_user.id
+    assert db_manager.consume_email_verification_token("consume_me_token", current_time) is None
+    assert db_manager.find_email_verification_token("consume_me_token") is None
+
+
+def test_consume_password_reset_token(sample_site, sample_user):
+    """Test that a reset token is marked used once and expired tokens are rejected"""
+    current_time = int(time.time())
+    for token, expires_at in [("reset_valid", current_time + 3600), ("reset_expired", current_time - 60)]:
+        db_manager.create_password_reset_token(PasswordResetToken(
+            token=token,
+            site_id=sample_site.id,
+            user_id=sample_user.id,
+            expires_at=expires_at,
+            created_at=current_time - 3600,
+            used=False
+        ))
+
+    consumed = db_manager.consume_password_reset_token("reset_valid", current_time)
+
+    assert consumed is not None
+    assert consumed.used is True
+    assert db_manager.consume_password_reset_token("reset_valid", current_time) is None
+    assert db_manager.consume_password_reset_token("reset_expired", current_time) is None
+
+
+def test_consume_email_change_request(sample_site, sample_user):
+    """Test that an email change request is consumed once and expired requests are rejected"""
+    current_time = int(time.time())
+    for token, expires_at in [("change_valid", current_time + 3600), ("change_expired", current_time - 60)]:
+        db_manager.create_email_change_request(EmailChangeRequest(
+            token=token,
+            site_id=sample_site.id,
+            user_id=sample_user.id,
+            new_email="changed@example.com",
+            expires_at=expires_at,
+            created_at=current_time - 3600
+        ))
+
+    consumed = db_manager.consume_email_change_request("change_valid", current_time)
+
+    assert consumed is not None
+    assert consumed.user_id == sample_user.id
+    assert consumed.new_email == "changed@example.com"
+    assert db_manager.consume_email_change_request("change_valid", current_time) is None
+    assert db_manager.consume_email_change_request("change_expired", current_time) is None
@@ -6,6 +6,9 @@ from models.auth_token import AuthToken
 from models.email_verification_token import EmailVerificationToken
 from models.password_reset_token import PasswordResetToken
 from models.email_change_request import EmailChangeRequest
+from schemas.auth_schemas import UserResponseSchema, AuthTokenResponseSchema
+from schemas.site_schemas import SiteResponseSchema
+from utils.serializers import serialize
 
 
 def test_site_to_dict():
@@ -150,3 +153,41 @@ def test_auth_token_from_dict():
     assert token.user_id == 1
     assert token.expires_at == current_time + 3600
     assert token.created_at == current_time
+
+
+def test_serialize_matches_schema_dump():
+    """Test that the compiled response serializers produce the same output as marshmallow"""
+    current_time = int(time.time())
+    site = Site(
+        id=1,
+        name="Test Site",
+        domain="test.example.com",
+        frontend_url="http://test.example.com",
+        email_from="noreply@test.example.com",
+        email_from_name="Test Site",
+        created_at=current_time,
+        updated_at=current_time
+    )
+    user = User(
+        id=2,
+        site_id=1,
+        email="test@example.com",
+        password_hash="hashed",
+        is_verified=True,
+        role=UserRole.ADMIN,
+        created_at=current_time,
+        updated_at=current_time
+    )
+    auth_token = AuthToken(
+        token="token",
+        site_id=1,
+        user_id=2,
+        expires_at=current_time + 3600,
+        created_at=current_time
+    )
+
+    assert serialize(SiteResponseSchema, site) == SiteResponseSchema().dump(site)
+    assert serialize(UserResponseSchema, user) == UserResponseSchema().dump(user)
+    assert serialize(UserResponseSchema, [user, user], many=True) == UserResponseSchema(many=True).dump([user, user])
+    assert serialize(AuthTokenResponseSchema, auth_token) == AuthTokenResponseSchema().dump(auth_token)
+    assert 'password_hash' not in serialize(UserResponseSchema, user)
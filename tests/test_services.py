@@ -1,7 +1,16 @@
+import threading
 import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from database import db_manager
+from models.auth_token import AuthToken
 from services.password_service import password_service
 from services.token_service import token_service
 from services.auth_service import auth_service
+from services.email_providers import MailgunProvider, SendGridProvider, NullProvider, create_email_provider
+from services.email_service import EmailService, email_service
+from config import Config, get_config, int_setting
 from models.user_role import UserRole
 
 
@@ -16,6 +25,19 @@ def test_password_hashing():
     assert password_service.verify_password("wrong_password", hashed) is False
 
 
+@pytest.mark.parametrize("value, message", [
+    ("3", "must be between 4 and 31"),
+    ("32", "must be between 4 and 31"),
+    ("twelve", "must be an integer")
+])
+def test_invalid_bcrypt_rounds_rejected(monkeypatch, value, message):
+    """Test that an invalid BCRYPT_ROUNDS is rejected when config is loaded"""
+    monkeypatch.setenv('BCRYPT_ROUNDS', value)
+
+    with pytest.raises(ValueError, match=f"BCRYPT_ROUNDS {message}"):
+        int_setting('BCRYPT_ROUNDS', 12, 4, 31)
+
+
 def test_token_generation():
     """Test secure token generation"""
     token1 = token_service.generate_token()
@@ -26,14 +48,30 @@ def test_token_generation():
     assert token1 != token2
 
 
-def test_create_auth_token(sample_site, sample_user):
+def test_create_auth_token(sample_site, sample_user, frozen_time):
     """Test creating an auth token"""
     auth_token = token_service.create_auth_token(sample_site.id, sample_user.id)
 
     assert auth_token.token is not None
     assert auth_token.site_id == sample_site.id
     assert auth_token.user_id == sample_user.id
-    assert auth_token.expires_at > int(time.time())
+    assert auth_token.created_at == frozen_time
+    assert auth_token.expires_at == frozen_time + token_service.auth_token_expiration
+
+
+def test_create_auth_tokens_bulk(sample_site, sample_user, admin_user):
+    """Test creating several auth tokens in one batch"""
+    auth_tokens = token_service.create_auth_tokens([
+        (sample_site.id, sample_user.id),
+        (sample_site.id, admin_user.id),
+        (sample_site.id, sample_user.id)
+    ])
+
+    assert len(auth_tokens) == 3
+    assert len({t.token for t in auth_tokens}) == 3
+    assert token_service.validate_auth_token(auth_tokens[0].token) == sample_user.id
+    assert token_service.validate_auth_token(auth_tokens[1].token) == admin_user.id
+    assert token_service.create_auth_tokens([]) == []
 
 
 def test_validate_auth_token(sample_site, sample_user):
@@ -45,19 +83,82 @@ def test_validate_auth_token(sample_site, sample_user):
     assert user_id == sample_user.id
 
 
-def test_validate_expired_auth_token(sample_site, sample_user):
-    """Test that expired tokens are invalid"""
-    from models.auth_token import AuthToken
-    from database import db_manager
+def test_validate_malformed_tokens():
+    """Test that malformed tokens are rejected"""
+    for token in ["", "not a token", "header.payload.signature", "a" * 256]:
+        assert token_service.validate_auth_token(token) is None
+        assert token_service.validate_email_verification_token(token) is None
+        assert token_service.validate_password_reset_token(token) is None
+        assert token_service.validate_email_change_token(token) is None
+
+
+def test_validate_auth_token_uses_cache(sample_site, sample_user):
+    """Test that a validated token is served from the cache until invalidated"""
+    auth_token = token_service.create_auth_token(sample_site.id, sample_user.id)
+    assert token_service.validate_auth_token(auth_token.token) == sample_user.id
+
+    # Remove the row behind the service's back - the cached validation still applies
+    db_manager.delete_auth_token(auth_token.token)
+    assert token_service.validate_auth_token(auth_token.token) == sample_user.id
+
+    token_service.invalidate_auth_token(auth_token.token)
+    assert token_service.validate_auth_token(auth_token.token) is None
+
+
+def test_invalidate_user_tokens_clears_cache(sample_site, sample_user):
+    """Test that invalidating a user's tokens also evicts them from the cache"""
+    auth_token = token_service.create_auth_token(sample_site.id, sample_user.id)
+    assert token_service.validate_auth_token(auth_token.token) == sample_user.id
+
+    token_service.invalidate_user_tokens(sample_user.id)
+
+    assert token_service.validate_auth_token(auth_token.token) is None
+
+
+def test_revocation_during_validation_is_not_cached(sample_site, sample_user, monkeypatch):
+    """Test that a token revoked while its validation is reading the database does not get cached"""
+    auth_token = token_service.create_auth_token(sample_site.id, sample_user.id)
+    find_auth_token_by_token = db_manager.find_auth_token_by_token
+
+    def find_then_logout(token):
+        found = find_auth_token_by_token(token)
+        token_service.invalidate_user_tokens(sample_user.id)
+        return found
+
+    monkeypatch.setattr(db_manager, 'find_auth_token_by_token', find_then_logout)
+    token_service.validate_auth_token(auth_token.token)
+
+    assert token_service.auth_token_cache.get(auth_token.token) is None
+    monkeypatch.setattr(db_manager, 'find_auth_token_by_token', find_auth_token_by_token)
+    assert token_service.validate_auth_token(auth_token.token) is None
+
+
+def test_get_user_uses_cache(sample_site):
+    """Test that user lookups are cached and dropped when the user is updated"""
+    user = auth_service.register_user(
+        site_id=sample_site.id,
+        email="cached@example.com",
+        password="old_password"
+    ).user
+
+    cached_user = auth_service.get_user(user.id)
+    assert auth_service.user_cache.get(user.id) is cached_user
+
+    updated_user = auth_service.change_password(user.id, "old_password", "new_password")
 
-    # Create an expired token
-    current_time = int(time.time())
+    assert auth_service.user_cache.get(user.id) is None
+    assert auth_service.get_user(user.id).password_hash == updated_user.password_hash
+
+
+def test_validate_expired_auth_token(sample_site, sample_user, frozen_time):
+    """Test that expired tokens are invalid"""
+    # Create a token that expired one second ago
     expired_token = AuthToken(
         token="expired_token",
         site_id=sample_site.id,
         user_id=sample_user.id,
-        expires_at=current_time - 3600,  # Expired 1 hour ago
-        created_at=current_time - 7200
+        expires_at=frozen_time - 1,
+        created_at=frozen_time - 3600
     )
     db_manager.create_auth_token(expired_token)
 
@@ -66,13 +167,33 @@ def test_validate_expired_auth_token(sample_site, sample_user):
     assert user_id is None
 
 
+def test_get_user_by_token_uses_token_service_clock(sample_site, sample_user, frozen_time):
+    """Test that token lookups with the user apply the same expiry rule as validate_auth_token"""
+    for token, expires_at in (("fresh_token", frozen_time + 1), ("stale_token", frozen_time - 1)):
+        db_manager.create_auth_token(AuthToken(
+            token=token,
+            site_id=sample_site.id,
+            user_id=sample_user.id,
+            expires_at=expires_at,
+            created_at=frozen_time - 3600
+        ))
+
+    # Both tokens are in the past by the real clock; only the frozen one decides
+    assert auth_service.get_user_by_token("fresh_token").id == sample_user.id
+    assert auth_service.get_user_by_token("stale_token") is None
+
+    # Second lookup is a cache hit and must give the same answers
+    assert auth_service.get_user_by_token("fresh_token").id == sample_user.id
+    assert token_service.validate_auth_token_with_user("fresh_token") == (sample_user.id, None)
+
+
 def test_register_user(sample_site):
     """Test user registration"""
     user = auth_service.register_user(
         site_id=sample_site.id,
         email="newuser@example.com",
         password="secure_password123"
-    )
+    ).user
 
     assert user.id > 0
     assert user.site_id == sample_site.id
@@ -90,31 +211,17 @@ def test_register_duplicate_email(sample_site):
         password="password1"
     )
 
-    try:
+    with pytest.raises(ValueError, match="(?i)already registered"):
         auth_service.register_user(
             site_id=sample_site.id,
             email="duplicate@example.com",
             password="password2"
         )
-        assert False, "Should have raised ValueError"
-    except ValueError as e:
-        assert "already registered" in str(e).lower()
 
 
-def test_login_success(sample_site):
+def test_login_success(sample_site, make_verified_user):
     """Test successful login"""
-    # Register user
-    auth_service.register_user(
-        site_id=sample_site.id,
-        email="login@example.com",
-        password="mypassword"
-    )
-
-    # Mark user as verified
-    from database import db_manager
-    user = db_manager.find_user_by_email(sample_site.id, "login@example.com")
-    user.is_verified = True
-    db_manager.update_user(user)
+    user = make_verified_user("login@example.com", "mypassword")
 
     # Login
     auth_token = auth_service.login(
@@ -127,31 +234,17 @@ def test_login_success(sample_site):
     assert auth_token.user_id == user.id
 
 
-def test_login_wrong_password(sample_site):
+def test_login_wrong_password(sample_site, make_verified_user):
     """Test login with wrong password"""
-    # Register user
-    auth_service.register_user(
-        site_id=sample_site.id,
-        email="wrongpw@example.com",
-        password="correct_password"
-    )
-
-    # Mark as verified
-    from database import db_manager
-    user = db_manager.find_user_by_email(sample_site.id, "wrongpw@example.com")
-    user.is_verified = True
-    db_manager.update_user(user)
+    make_verified_user("wrongpw@example.com", "correct_password")
 
     # Try login with wrong password
-    try:
+    with pytest.raises(ValueError, match="(?i)invalid credentials"):
         auth_service.login(
             site_id=sample_site.id,
             email="wrongpw@example.com",
             password="wrong_password"
         )
-        assert False, "Should have raised ValueError"
-    except ValueError as e:
-        assert "invalid credentials" in str(e).lower()
 
 
 def test_login_unverified_email(sample_site):
@@ -162,50 +255,34 @@ def test_login_unverified_email(sample_site):
         password="password"
     )
 
-    try:
+    with pytest.raises(ValueError, match="(?i)not verified"):
         auth_service.login(
             site_id=sample_site.id,
             email="unverified@example.com",
             password="password"
         )
-        assert False, "Should have raised ValueError"
-    except ValueError as e:
-        assert "not verified" in str(e).lower()
 
 
 def test_verify_email(sample_site):
     """Test email verification"""
-    user = auth_service.register_user(
+    registration = auth_service.register_user(
         site_id=sample_site.id,
         email="verify@example.com",
         password="password"
     )
-
-    # Get verification token
-    from database import db_manager
-    with db_manager.get_cursor() as cursor:
-        cursor.execute(
-            "SELECT token FROM email_verification_tokens WHERE user_id = %s",
-            (user.id,)
-        )
-        result = cursor.fetchone()
-        verification_token = result['token']
+    user = registration.user
 
     # Verify email
-    result = auth_service.verify_email(verification_token)
+    result = auth_service.verify_email(registration.verification_token)
 
     assert result.user.is_verified is True
     assert result.user.id == user.id
     assert result.redirect_url == sample_site.frontend_url
 
 
-def test_change_password(sample_site):
+def test_change_password(make_verified_user):
     """Test password change"""
-    user = auth_service.register_user(
-        site_id=sample_site.id,
-        email="changepw@example.com",
-        password="old_password"
-    )
+    user = make_verified_user("changepw@example.com", "old_password")
 
     updated_user = auth_service.change_password(
         user_id=user.id,
@@ -220,13 +297,9 @@ def test_change_password(sample_site):
     assert password_service.verify_password("old_password", updated_user.password_hash) is False
 
 
-def test_password_reset_flow(sample_site):
+def test_password_reset_flow(sample_site, make_verified_user):
     """Test complete password reset flow"""
-    user = auth_service.register_user(
-        site_id=sample_site.id,
-        email="reset@example.com",
-        password="original_password"
-    )
+    user = make_verified_user("reset@example.com", "original_password")
 
     # Request password reset
     reset_token = auth_service.request_password_reset(sample_site.id, "reset@example.com")
@@ -238,3 +311,210 @@ def test_password_reset_flow(sample_site):
 
     assert updated_user.id == user.id
     assert password_service.verify_password("new_reset_password", updated_user.password_hash) is True
+
+
+def test_create_email_provider(monkeypatch):
+    """Test that EMAIL_PROVIDER selects the email provider"""
+    config = get_config()
+    monkeypatch.setattr(config, 'MAILGUN_API_KEY', 'mg_key')
+    monkeypatch.setattr(config, 'MAILGUN_DOMAIN', 'mg.example.com')
+    monkeypatch.setattr(config, 'SENDGRID_API_KEY', 'sg_key')
+
+    monkeypatch.setattr(config, 'EMAIL_PROVIDER', 'mailgun')
+    assert isinstance(create_email_provider(config), MailgunProvider)
+
+    monkeypatch.setattr(config, 'EMAIL_PROVIDER', 'SendGrid')
+    assert isinstance(create_email_provider(config), SendGridProvider)
+
+    monkeypatch.setattr(config, 'EMAIL_PROVIDER', 'none')
+    assert isinstance(create_email_provider(config), NullProvider)
+
+    monkeypatch.setattr(config, 'EMAIL_PROVIDER', 'carrier_pigeon')
+    with pytest.raises(ValueError):
+        create_email_provider(config)
+
+
+def test_tests_send_no_real_emails():
+    """Test that the service under test delivers through the NullProvider"""
+    assert isinstance(email_service.provider, NullProvider)
+
+
+def test_mailgun_provider_request():
+    """Test building a Mailgun messages request"""
+    provider = MailgunProvider(api_key="mg_key", domain="mg.example.com")
+
+    request_kwargs = provider.build_request(
+        "user@example.com", "Subject", "<p>Hi</p>", "noreply@example.com", "Example", "Hi"
+    )
+
+    assert provider.api_url == "https://api.mailgun.net/v3/mg.example.com/messages"
+    assert request_kwargs['auth'] == ("api", "mg_key")
+    assert request_kwargs['data']['from'] == "Example <noreply@example.com>"
+    assert request_kwargs['data']['text'] == "Hi"
+
+
+def test_provider_retry_policy():
+    """Test that only sends the provider cannot have accepted are retried, with a capped Retry-After"""
+    provider = MailgunProvider(api_key="mg_key", domain="mg.example.com")
+    retry = provider.session.get_adapter(provider.api_url).max_retries
+
+    assert set(retry.status_forcelist) == {429, 503}
+    assert retry.read == 0
+    assert retry.retry_after_max <= retry.backoff_max
+
+
+def test_provider_limits_concurrent_sends(monkeypatch):
+    """Test that outbound provider calls are capped at MAX_CONCURRENT_SENDS"""
+    monkeypatch.setattr(Config, 'MAX_CONCURRENT_SENDS', 2)
+    provider = SendGridProvider(api_key="sg_key")
+
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def fake_post(url, **kwargs):
+        with lock:
+            in_flight.append(url)
+            peak.append(len(in_flight))
+        time.sleep(0.05)
+        with lock:
+            in_flight.pop()
+        return SimpleNamespace(status_code=202, content=b'', text='')
+
+    monkeypatch.setattr(provider.session, 'post', fake_post)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(
+            lambda i: provider.send(f"user{i}@example.com", "Subject", "<p>Hi</p>", "noreply@example.com", "Example"),
+            range(6)
+        ))
+
+    assert all(results)
+    assert max(peak) <= 2
+
+
+def test_sendgrid_provider_request():
+    """Test building a SendGrid mail send request"""
+    provider = SendGridProvider(api_key="sg_key")
+
+    request_kwargs = provider.build_request(
+        "user@example.com", "Subject", "<p>Hi</p>", "noreply@example.com", "Example", "Hi"
+    )
+
+    assert request_kwargs['headers'] == {'Authorization': 'Bearer sg_key'}
+    payload = request_kwargs['json']
+    assert payload['personalizations'] == [{'to': [{'email': "user@example.com"}]}]
+    assert payload['from'] == {'email': "noreply@example.com", 'name': "Example"}
+    assert [part['type'] for part in payload['content']] == ['text/plain', 'text/html']
+
+
+def test_unconfigured_provider_falls_back_to_null(monkeypatch):
+    """Test that a provider without credentials is replaced by the null provider at startup"""
+    config = get_config()
+    monkeypatch.setattr(config, 'EMAIL_PROVIDER', 'mailgun')
+    monkeypatch.setattr(config, 'MAILGUN_API_KEY', '')
+
+    provider = create_email_provider(config)
+
+    assert isinstance(provider, NullProvider)
+    assert provider.send("user@example.com", "Subject", "<p>Hi</p>", "noreply@example.com", "Example") is False
+
+
+class RecordingProvider(NullProvider):
+    """Provider that keeps every email instead of sending it"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, to_email, subject, html_content, from_email, from_name, text_content=None) -> bool:
+        self.sent.append({'subject': subject, 'html': html_content, 'text': text_content})
+        return True
+
+
+def test_email_html_escapes_site_name():
+    """Test that site names are HTML-escaped in the HTML body but kept raw in the text body"""
+    provider = RecordingProvider()
+    service = EmailService(provider=provider)
+    site_name = '<b>&"'
+
+    service.send_password_reset_email(
+        "user@example.com", "token", site_name, "http://example.com/", "noreply@example.com", "Site"
+    )
+    service.executor.shutdown()
+
+    sent = provider.sent[0]
+    assert "&lt;b&gt;&amp;&quot;" in sent['html']
+    assert site_name not in sent['html']
+    assert site_name in sent['text']
+    assert sent['subject'] == f"Reset your password for {site_name}"
+
+
+class RaisingProvider(NullProvider):
+    """Provider whose sends always fail with an exception"""
+
+    def send(self, *args, **kwargs) -> bool:
+        raise RuntimeError("provider exploded")
+
+
+def test_background_send_error_is_logged(caplog):
+    """Test that an exception from the provider in a background send is logged, not lost"""
+    service = EmailService(provider=RaisingProvider())
+
+    future = service.enqueue(
+        service.send_verification_email,
+        to_email="user@example.com",
+        token="token",
+        site_name="Test Site",
+        from_email="noreply@example.com",
+        from_name="Test Site"
+    )
+
+    assert future.result(timeout=5) is False
+    service.executor.shutdown()
+
+    errors = [r for r in caplog.records if r.levelname == 'ERROR' and r.name == 'services.email_service']
+    assert len(errors) == 1
+    assert "send_verification_email" in errors[0].getMessage()
+    assert "user@example.com" in errors[0].getMessage()
+    assert "provider exploded" in errors[0].getMessage()
+
+
+class BlockingProvider(NullProvider):
+    """Provider whose sends wait until released, as during a slow provider outage"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def send(self, *args, **kwargs) -> bool:
+        self.release.wait(timeout=5)
+        return True
+
+
+def test_email_send_queue_is_bounded(monkeypatch, caplog):
+    """Test that emails beyond EMAIL_SEND_QUEUE_SIZE are dropped and logged instead of queued"""
+    monkeypatch.setattr(Config, 'EMAIL_SEND_WORKERS', 1)
+    monkeypatch.setattr(Config, 'EMAIL_SEND_QUEUE_SIZE', 2)
+    provider = BlockingProvider()
+    service = EmailService(provider=provider)
+
+    def enqueue():
+        return service.enqueue(
+            service.send_email,
+            to_email="user@example.com",
+            subject="Subject",
+            html_content="<p>Hi</p>",
+            from_email="noreply@example.com",
+            from_name="Site"
+        )
+
+    accepted = [enqueue(), enqueue()]
+    overflow = enqueue()
+
+    assert overflow.done() and overflow.result() is False
+    assert any("queue full" in r.getMessage() for r in caplog.records)
+
+    # Finished sends free their slots
+    provider.release.set()
+    assert [f.result(timeout=5) for f in accepted] == [True, True]
+    assert enqueue().result(timeout=5) is True
+    service.executor.shutdown()
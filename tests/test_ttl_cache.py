@@ -0,0 +1,94 @@
+import pytest
+from types import SimpleNamespace
+import utils.ttl_cache as ttl_cache
+from utils.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's monotonic clock with one the test advances by hand"""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_get_and_set():
+    """Test storing and reading back a value"""
+    cache = TTLCache(maxsize=10, ttl=30)
+
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert len(cache) == 1
+
+
+def test_evicts_least_recently_used():
+    """Test that a full cache evicts the entry read or written longest ago"""
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    """Test that entries are dropped once they are ttl seconds old"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+
+    clock[0] += 29.9
+    assert cache.get("a") == 1
+
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_set_refreshes_ttl(clock):
+    """Test that storing a key again restarts its ttl"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+
+    clock[0] += 20
+    cache.set("a", 2)
+    clock[0] += 20
+
+    assert cache.get("a") == 2
+
+
+def test_pop_and_discard_where():
+    """Test removing entries by key and by value"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("t1", (1, 100))
+    cache.set("t2", (2, 100))
+    cache.set("t3", (1, 200))
+
+    cache.pop("t2")
+    cache.pop("missing")
+    cache.discard_where(lambda value: value[0] == 1)
+
+    assert len(cache) == 0
+
+    cache.set("t4", (3, 100))
+    cache.clear()
+    assert cache.get("t4") is None
+
+
+@pytest.mark.parametrize("maxsize, ttl", [(10, 0), (0, 30)])
+def test_disabled_cache_stores_nothing(maxsize, ttl):
+    """Test that a ttl or maxsize of 0 turns the cache off"""
+    cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    cache.set("a", 1)
+
+    assert cache.enabled is False
+    assert cache.get("a") is None
+    assert len(cache) == 0